@@ -1,7 +1,7 @@
 import time
 from pywinauto import Desktop
-import psutil
-from shortcut_manager import ShortcutManager
+from shortcut_manager import get_default_shortcut_manager
+from debug_log import logger
 
 class ActionDetector:
     """Detects user actions and suggests appropriate shortcuts"""
@@ -11,7 +11,7 @@ class ActionDetector:
         self.ui_desk = Desktop(backend="uia")
         
         # Initialize central shortcut manager
-        self.shortcut_manager = ShortcutManager()
+        self.shortcut_manager = get_default_shortcut_manager()
         
         # Excel cell tracking
         self.current_excel_cell = None
@@ -39,11 +39,15 @@ class ActionDetector:
         self.last_chrome_tab_time = 0
         self.tab_switch_threshold = 5.0  # 5 seconds to detect tab switch
     
-    def detect_action(self, x, y, app_name):
-        """Detect what action the user performed and suggest shortcuts"""
+    def detect_action(self, x, y, app_name_lower, element_info=None):
+        """Detect what action the user performed and suggest shortcuts (app name already lowercased)
+
+        element_info is the element UIAutomationManager already detected for
+        this click; when given, the element is not looked up a second time.
+        """
         # Check for Excel-specific actions
-        if app_name and "excel" in app_name.lower():
-            return self.detect_excel_action(x, y)
+        if app_name_lower and "excel" in app_name_lower:
+            return self.detect_excel_action(x, y, element_info)
         
         # Check for other application actions
         return None
@@ -57,13 +61,12 @@ class ActionDetector:
         except:
             return None
     
-    def detect_excel_action(self, x, y):
+    def detect_excel_action(self, x, y, element_info=None):
         """Detect Excel-specific actions"""
         try:
-            
-            # Get element at click point
-            element = self.ui_desk.from_point(x, y)
-            element_info = element.element_info
+            # Get element at click point, unless the caller already has it
+            if element_info is None or element_info.error:
+                element_info = self.ui_desk.from_point(x, y).element_info
             
             shortcut_info = None
             
@@ -94,11 +97,12 @@ class ActionDetector:
             
             # Check if this is a button/ribbon click
             elif self.is_excel_button(element_info):
+                name_lower = element_info.name.lower()
                 # Check specifically for redo/repeat button
-                if "redo" in element_info.name.lower() or "repeat" in element_info.name.lower():
+                if "redo" in name_lower or "repeat" in name_lower:
                     shortcut_info = self.handle_redo_button_click(element_info)
                 # Check for formatting buttons that should show shortcuts immediately
-                elif any(format_btn in element_info.name.lower() for format_btn in ['bold', 'italic', 'underline']):
+                elif any(format_btn in name_lower for format_btn in ['bold', 'italic', 'underline']):
                     shortcut_info = self.handle_formatting_button_click(element_info)
                     # Return immediately to prevent repeated action logic from running
                     return shortcut_info
@@ -215,7 +219,8 @@ class ActionDetector:
         self.current_excel_row = cell_info['row']
         self.current_excel_col = cell_info['col']
         
-        print(f"📍 Excel Cell Selected: {cell_info['address']} (Row {cell_info['row']}, Col {cell_info['col']})")
+        logger.debug("📍 Excel Cell Selected: %s (Row %s, Col %s)",
+                     cell_info['address'], cell_info['row'], cell_info['col'])
         
         # Check if this is a boundary jump that suggests Ctrl + Up
         shortcut_info = None
@@ -225,16 +230,17 @@ class ActionDetector:
         
         # Check if this is a double-click on the same cell (suggest F2) - PRIORITY OVER BOUNDARY JUMP
         time_diff = current_time - self.last_cell_click_timestamp
-        print(f"🔍 F2 Debug: last_cell_click={self.last_cell_click}, current_cell={cell_info['address']}, time_diff={time_diff:.3f}s, threshold={self.f2_double_click_threshold}")
+        logger.debug("🔍 F2 Debug: last_cell_click=%s, current_cell=%s, time_diff=%.3fs, threshold=%s",
+                     self.last_cell_click, cell_info['address'], time_diff, self.f2_double_click_threshold)
         
         if (self.last_cell_click == cell_info['address'] and 
             time_diff < self.f2_double_click_threshold):
             # F2 detection takes priority over boundary jump
             shortcut_info = self.suggest_f2_shortcut(cell_info['address'])
-            print(f"🔍 F2 shortcut detected for double-click on {cell_info['address']}")
+            logger.debug("🔍 F2 shortcut detected for double-click on %s", cell_info['address'])
         elif shortcut_info is None:
             # Only show boundary jump if F2 wasn't detected
-            print(f"🔍 No F2 detected, boundary jump shortcut: {shortcut_info}")
+            logger.debug("🔍 No F2 detected, boundary jump shortcut: %s", shortcut_info)
         
         # Update tracking for next potential double-click
         self.last_cell_click = cell_info['address']
@@ -279,9 +285,9 @@ class ActionDetector:
         # Return shortcut info so it can be logged by the caller
         return shortcut_info
     
-    def detect_chrome_tab_switch(self, app_name, window_title):
-        """Detect if user manually switched tabs in Chrome"""
-        if not app_name or "chrome" not in app_name.lower():
+    def detect_chrome_tab_switch(self, app_name_lower, window_title):
+        """Detect if user manually switched tabs in Chrome (app name already lowercased)"""
+        if not app_name_lower or "chrome" not in app_name_lower:
             return None
         
         current_time = time.time()
@@ -329,12 +335,12 @@ class ActionDetector:
         else:
             return None
         
-        print(f"📍 Excel Formatting Button: {element_info.name} → {shortcut_info[0]}")
+        logger.debug("📍 Excel Formatting Button: %s → %s", element_info.name, shortcut_info[0])
         return shortcut_info
 
     def handle_redo_button_click(self, element_info):
         """Handle when user clicks on Excel redo/repeat button"""
-        print(f"📍 Excel Redo Button Selected: {element_info.name}")
+        logger.debug("📍 Excel Redo Button Selected: %s", element_info.name)
         
         # Return shortcut info so it can be logged by the caller
         return ("Ctrl + Y", "Redo/Repeat action")
@@ -344,13 +350,13 @@ class ActionDetector:
         current_time = time.time()
         action_name = element_info.name
         
-        print(f"📍 Excel Button Clicked: {action_name}")
+        logger.debug("📍 Excel Button Clicked: %s", action_name)
         
         # Check if this is the same action as before (within threshold)
         if (self.last_action == action_name and 
             current_time - self.last_action_timestamp < self.repeat_action_threshold):
             
-            print(f"🔍 Repeated action detected: {action_name}")
+            logger.debug("🔍 Repeated action detected: %s", action_name)
             shortcut_info = self.suggest_ctrl_y_shortcut(action_name)
             
             # Reset tracking after suggesting
@@ -366,21 +372,21 @@ class ActionDetector:
 
     def handle_column_header_click(self, element_info):
         """Handle when user clicks on an Excel column header"""
-        print(f"📍 Excel Column Header Selected: {element_info.name}")
+        logger.debug("📍 Excel Column Header Selected: %s", element_info.name)
         
         # Return shortcut info so it can be logged by the caller
         return ("Ctrl + Space", "Select entire column")
     
     def handle_row_header_click(self, element_info):
         """Handle when user clicks on an Excel row header"""
-        print(f"📍 Excel Row Header Selected: {element_info.name}")
+        logger.debug("📍 Excel Row Header Selected: %s", element_info.name)
         
         # Return shortcut info so it can be logged by the caller
         return ("Shift + Space", "Select entire row")
     
     def handle_sheet_tab_click(self, element_info):
         """Handle when user clicks on an Excel sheet tab"""
-        print(f"📍 Excel Sheet Tab Selected: {element_info.name}")
+        logger.debug("📍 Excel Sheet Tab Selected: %s", element_info.name)
         
         # Return shortcut info so it can be logged by the caller
         return ("Ctrl + Page Up/Page Down", "Switch between worksheets")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Click Worker for Shortcut Coach
+Analyzes mouse clicks on a background thread so the mouse hook returns immediately
+"""
+
+import queue
+import threading
+from debug_log import logger
+
+
+class ClickWorker:
+    """Runs click analysis (UIA lookup, foreground wait, action detection) off the input thread"""
+    
+    __slots__ = ("coach", "click_queue", "thread")
+    
+    def __init__(self, shortcut_coach):
+        self.coach = shortcut_coach
+        self.click_queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        """Start the worker thread"""
+        self.thread.start()
+    
+    def submit(self, x, y, button):
+        """Queue a click press for analysis"""
+        self.click_queue.put((x, y, button))
+    
+    def stop(self):
+        """Let the worker finish the clicks already queued, then end it"""
+        if self.thread.is_alive():
+            self.click_queue.put(None)
+            self.thread.join(timeout=2.0)
+    
+    def _run(self):
+        """Analyze queued clicks in order until a None sentinel arrives"""
+        while True:
+            click = self.click_queue.get()
+            if click is None:
+                break
+            try:
+                self.analyze_click(*click)
+            except Exception as e:
+                # Keep the worker alive for the clicks that follow
+                print(f"❌ Error analyzing click: {e}")
+    
+    def _suggestion_event(self, shortcut, description):
+        """Build the pending "Shortcut Suggested" event for a shortcut tuple"""
+        db_key = self.coach.shortcut_manager.get_shortcut_database_key((shortcut, description))
+        return ("Shortcut Suggested", f"{shortcut} for {description}", None, None, db_key)
+    
+    def analyze_click(self, x, y, button):
+        """Detect the clicked UI element, suggest shortcuts and log the click"""
+        coach = self.coach
+        try:
+            # Get UI element information
+            element_info = coach.ui_manager.detect_ui_element(x, y)
+            if not element_info:
+                return
+            
+            app_name = element_info.app_name
+            element_name = element_info.name
+            
+            # Check for Chrome tab switching detection
+            if "chrome" in element_info.app_name_lower:
+                # Get current window info for tab switching detection
+                window_info = coach.ui_manager.get_active_window_info()
+                if window_info and window_info.get("title"):
+                    tab_switch_shortcut = coach.action_detector.detect_chrome_tab_switch(
+                        element_info.app_name_lower, window_info.get("title")
+                    )
+                    if tab_switch_shortcut:
+                        shortcut, description = tab_switch_shortcut
+                        # Send notification for tab switching
+                        coach.notification_system.suggest_shortcut(description, shortcut)
+                        # Log the shortcut opportunity
+                        coach.log_events([self._suggestion_event(shortcut, description)])
+                        return  # Don't process further if we detected tab switching
+            
+            # Events from this click, written together in one batch
+            pending = []
+            
+            # Check for context menu clicks (right-click)
+            if button.name == 'right':
+                # Get shortcut suggestion from UI automation
+                shortcut_info = coach.ui_manager.get_shortcut_suggestion(element_info)
+                
+                if shortcut_info:
+                    shortcut, description = shortcut_info
+                    # Send notification
+                    coach.notification_system.suggest_shortcut(description, shortcut)
+                    # Log the shortcut opportunity
+                    pending.append(self._suggestion_event(shortcut, description))
+                
+                # Log the context menu click
+                pending.append(("Context Menu Click", f"Clicked {element_name}",
+                                app_name, element_info.window_title, None))
+                coach.log_events(pending)
+                logger.debug("🖱️ Context Menu Click: %s in %s", element_name, app_name)
+            
+            # Check for regular clicks (left-click)
+            else:
+                # Get shortcut suggestion from UI automation
+                shortcut_info = coach.ui_manager.get_shortcut_suggestion(element_info)
+                
+                if shortcut_info:
+                    shortcut, description = shortcut_info
+                    # Send notification
+                    coach.notification_system.suggest_shortcut(description, shortcut)
+                    # Log the shortcut opportunity
+                    pending.append(self._suggestion_event(shortcut, description))
+                
+                # Check for action detector shortcuts (Excel, etc.)
+                action_shortcut = coach.action_detector.detect_action(x, y, element_info.app_name_lower, element_info)
+                if action_shortcut:
+                    shortcut, description = action_shortcut
+                    # Send notification for action detector shortcuts
+                    coach.notification_system.suggest_shortcut(description, shortcut)
+                    # Log the shortcut opportunity
+                    pending.append(self._suggestion_event(shortcut, description))
+                
+                # Log the UI element click
+                pending.append(("UI Element Click", f"Clicked {element_name}",
+                                app_name, element_info.window_title, None))
+                coach.log_events(pending)
+                logger.debug("🖱️ Clicked: %s in %s", element_name, app_name)
+                
+        except Exception as e:
+            print(f"❌ Error analyzing click: {e}")
@@ -4,23 +4,34 @@ Core System for Shortcut Coach
 Handles the main ShortcutCoach class and core system functionality
 """
 
-import time
 import sys
+import signal
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from database import DatabaseManager
 from screenshot import ScreenshotManager
-from notification_pyqt6 import PyQt6NotificationSystem as NotificationSystem
+from notification_system import PyQt6NotificationSystem as NotificationSystem
 from input_monitor import InputMonitor
 from context_analyzer import ContextAnalyzer
 from window_monitor import WindowMonitor
 from action_detector import ActionDetector
 from gui_manager import ShortcutCoachGUI
 from ui_automation_manager import UIAutomationManager
-from shortcut_manager import ShortcutManager
+from event_writer import EventWriter
+from click_worker import ClickWorker
+from shortcut_manager import get_default_shortcut_manager
+from debug_log import logger
 
 class ShortcutCoach:
     """Main Shortcut Coach system that coordinates all components"""
     
+    __slots__ = (
+        "qt_app", "db_manager", "screenshot_manager", "notification_system",
+        "window_monitor", "context_analyzer", "action_detector", "ui_manager",
+        "shortcut_manager", "gui", "input_monitor", "running", "foreground",
+        "window_timer", "event_writer", "click_worker"
+    )
+    
     def __init__(self):
         # Initialize PyQt6 application in main thread
         self.qt_app = QApplication([])
@@ -41,7 +52,7 @@ class ShortcutCoach:
         self.ui_manager = UIAutomationManager(self.notification_system)
         
         # Initialize central shortcut manager
-        self.shortcut_manager = ShortcutManager()
+        self.shortcut_manager = get_default_shortcut_manager()
         
         # Initialize GUI
         self.gui = ShortcutCoachGUI(self)
@@ -59,6 +70,21 @@ class ShortcutCoach:
         # System state
         self.running = False
         
+        # (app_name, window_title) of the foreground window, refreshed by the
+        # window timer and used to attribute key events without a Win32 lookup each
+        self.foreground = ("", "")
+        
+        # Polls for window changes while Qt's event loop runs
+        self.window_timer = QTimer()
+        self.window_timer.setInterval(100)
+        self.window_timer.timeout.connect(self.poll_window)
+        
+        # Logged events are written in batches on the writer's thread
+        self.event_writer = EventWriter(self.db_manager, self.gui.data_changed.emit)
+        
+        # Click analysis runs on its own thread so the mouse hook callback returns immediately
+        self.click_worker = ClickWorker(self)
+        
         print("🎯 Shortcut Coach initialized successfully!")
         print("📊 GUI is now visible with live tracking!")
         print("🎯 Now tracking UI elements in real-time using Windows UI Automation!")
@@ -66,50 +92,92 @@ class ShortcutCoach:
         print("🔴 Check the Live Tracker tab to see real-time events!")
         print("-" * 50)
         
+    def _prepare_event(self, event_type, details, app_name=None, window_title=None,
+                       context_action=None, precise=True, coords=None):
+        """Fill in window info and apply dedup; returns a database row or None
+        
+        Non-precise events (keystrokes etc.) take missing window info from the
+        foreground snapshot; precise ones (clicks) query the active window.
+        """
+        ui_manager = self.ui_manager
+        
+        if not precise and (not app_name or not window_title):
+            snapshot_app, snapshot_title = self.foreground
+            if snapshot_app:
+                app_name = app_name or snapshot_app
+                window_title = window_title or snapshot_title
+        
+        # Get current window info if not provided
+        if not app_name or not window_title:
+            window_info = ui_manager.get_active_window_info()
+            if not app_name:
+                app_name = window_info["app_name"]
+            if not window_title:
+                window_title = window_info["title"]
+        
+        # Check if we should log this event (prevent duplicates)
+        if not ui_manager.should_log_event(event_type, details, app_name, coords):
+            return None
+        
+        return (event_type, details, window_title, app_name, context_action)
+    
     def log_event(self, event_type, details, x=None, y=None, app_name=None, 
                   window_title=None, context_action=None):
-        """Log an event to the database"""
+        """Log an event to the database
+        
+        Click events (with coordinates) look the window up fresh, since the user
+        may have just switched to it; other events use the foreground snapshot.
+        """
         try:
-            # Get current window info if not provided
-            if not app_name or not window_title:
-                window_info = self.ui_manager.get_active_window_info()
-                if not app_name:
-                    app_name = window_info["app_name"]
-                if not window_title:
-                    window_title = window_info["title"]
-            
-            # Check if we should log this event (prevent duplicates)
-            if not self.ui_manager.should_log_event(event_type, details, app_name):
+            coords = (x, y) if x is not None and y is not None else None
+            row = self._prepare_event(event_type, details, app_name, window_title, context_action,
+                                      precise=coords is not None, coords=coords)
+            if row is None:
                 return
+            _, _, window_title, app_name, _ = row
             
-            # Log to database
-            self.db_manager.log_event(
-                event_type=event_type,
-                details=details,
-                app_name=app_name,
-                window_title=window_title,
-                context_action=context_action
-            )
+            # Queue for the next batched database write
+            self.event_writer.enqueue((row,))
             
             # Print to console for debugging
-            print(f"📝 {event_type}: {details} | {app_name} - {window_title}")
+            logger.debug("📝 %s: %s | %s - %s", event_type, details, app_name, window_title)
             
         except Exception as e:
             print(f"❌ Error logging event: {e}")
     
+    def log_events(self, events):
+        """Log several events, queued together for the next database write.
+        
+        Each event is (event_type, details, app_name, window_title, context_action).
+        """
+        try:
+            rows = []
+            prepare = self._prepare_event
+            for event in events:
+                row = prepare(*event)
+                if row is not None:
+                    rows.append(row)
+                    logger.debug("📝 %s: %s | %s - %s", row[0], row[1], row[3], row[2])
+            
+            if rows:
+                self.event_writer.enqueue(rows)
+            
+        except Exception as e:
+            print(f"❌ Error logging events: {e}")
+    
     def on_key_press(self, key):
         """Handle key press events"""
         try:
             key_name = str(key)
-            print(f"⌨️ Key Press: {key_name}")
+            logger.debug("⌨️ Key Press: %s", key_name)
             
-            # Get current active window info to get the app name
-            window_info = self.ui_manager.get_active_window_info()
-            app_name = window_info.get("app_name", "Unknown")
-            window_title = window_info.get("title", "Unknown")
+            # Attribute the key press to the last known foreground window
+            app_name, window_title = self.foreground
+            app_name = app_name or "Unknown"
+            window_title = window_title or "Unknown"
             
             # Debug output for keyboard events
-            print(f"🔍 Key press in app: {app_name} - {window_title}")
+            logger.debug("🔍 Key press in app: %s - %s", app_name, window_title)
             
             # Log the key press with proper app name
             self.log_event(
@@ -124,93 +192,9 @@ class ShortcutCoach:
             print(f"❌ Error handling key press: {e}")
     
     def on_mouse_click(self, x, y, button, pressed):
-        """Handle mouse click events"""
-        if not pressed:
-            return
-        
-        try:
-            # Get UI element information
-            element_info = self.ui_manager.detect_ui_element(x, y)
-            if not element_info:
-                return
-            
-            app_name = element_info.get("app_name", "Unknown")
-            element_name = element_info.get("name", "Unknown Element")
-            
-            # Check for Chrome tab switching detection
-            if app_name and "chrome" in app_name.lower():
-                # Get current window info for tab switching detection
-                window_info = self.ui_manager.get_active_window_info()
-                if window_info and window_info.get("title"):
-                    tab_switch_shortcut = self.action_detector.detect_chrome_tab_switch(
-                        app_name, window_info.get("title")
-                    )
-                    if tab_switch_shortcut:
-                        shortcut, description = tab_switch_shortcut
-                        # Send notification for tab switching
-                        self.notification_system.suggest_shortcut(description, shortcut)
-                        # Log the shortcut opportunity
-                        db_key = self.shortcut_manager.get_shortcut_database_key((shortcut, description))
-                        self.log_event("Shortcut Suggested", f"{shortcut} for {description}",
-                                     context_action=db_key)
-                        return  # Don't process further if we detected tab switching
-            
-            # Check for context menu clicks (right-click)
-            if button.name == 'right':
-                # Get shortcut suggestion from UI automation
-                shortcut_info = self.ui_manager.get_shortcut_suggestion(element_info)
-                
-                if shortcut_info:
-                    shortcut, description = shortcut_info
-                    # Send notification
-                    self.notification_system.suggest_shortcut(description, shortcut)
-                    # Log the shortcut opportunity
-                    db_key = self.shortcut_manager.get_shortcut_database_key((shortcut, description))
-                    self.log_event("Shortcut Suggested", f"{shortcut} for {description}",
-                                 context_action=db_key)
-                
-                # Log the context menu click
-                self.log_event("Context Menu Click", f"Clicked {element_name}",
-                             app_name=app_name, window_title=element_info.get("window_title", ""))
-                print(f"🖱️ Context Menu Click: {element_name} in {app_name}")
-            
-            # Check for regular clicks (left-click)
-            else:
-                # Get shortcut suggestion from UI automation
-                shortcut_info = self.ui_manager.get_shortcut_suggestion(element_info)
-                
-                if shortcut_info:
-                    shortcut, description = shortcut_info
-                    # Send notification
-                    self.notification_system.suggest_shortcut(description, shortcut)
-                    # Log the shortcut opportunity
-                    db_key = self.shortcut_manager.get_shortcut_database_key((shortcut, description))
-                    self.log_event("Shortcut Suggested", f"{shortcut} for {description}",
-                                 context_action=db_key)
-                
-                # Check for action detector shortcuts (Excel, etc.)
-                action_shortcut = self.action_detector.detect_action(x, y, app_name)
-                if action_shortcut:
-                    shortcut, description = action_shortcut
-                    # Send notification for action detector shortcuts
-                    self.notification_system.suggest_shortcut(description, shortcut)
-                    # Log the shortcut opportunity
-                    db_key = self.shortcut_manager.get_shortcut_database_key((shortcut, description))
-                    self.log_event("Shortcut Suggested", f"{shortcut} for {description}",
-                                 context_action=db_key)
-                
-                # Log the UI element click
-                self.log_event("UI Element Click", f"Clicked {element_name}",
-                             app_name=app_name, window_title=element_info.get("window_title", ""))
-                print(f"🖱️ Clicked: {element_name} in {app_name}")
-                
-        except Exception as e:
-            print(f"❌ Error in on_mouse_click: {e}")
-        
-        # Handle right click separately
-        if pressed and button.name == 'right':
-            # Don't log here - InputMonitor already logged it
-            pass
+        """Handle mouse click events by queueing presses for the click worker"""
+        if pressed:
+            self.click_worker.submit(x, y, button)
     
     def start_tracking(self):
         """Start event tracking"""
@@ -224,27 +208,26 @@ class ShortcutCoach:
             
             self.running = True
             
+            # Start the database writer and click worker before any input can be queued
+            self.event_writer.start()
+            self.click_worker.start()
+            self.ui_manager.start()
+            
             # Start input monitoring
             input_started = self.input_monitor.start()
             if not input_started:
                 print("⚠️ Warning: Input monitoring failed, continuing with window tracking only...")
             
-            # Keep the main thread alive and track windows
+            # Run Qt's event loop on the main thread; window tracking is timer driven
             try:
-                while self.running:
-                    # Process Qt events to keep GUI and notifications working
-                    self.qt_app.processEvents()
-                    time.sleep(0.1)  # Reduced sleep time for better responsiveness
-                    
-                    # Log window changes periodically
-                    window_title, app_name = self.window_monitor.check_window_change()
-                    if window_title:
-                        print(f"🖥️ Active Window: {app_name} - {window_title}")
+                # Ctrl+C is delivered whenever the window timer runs Python code
+                signal.signal(signal.SIGINT, self._on_interrupt)
+                self.window_timer.start()
+                self.qt_app.exec()
+                if self.running:
+                    # Event loop ended on its own (last window closed)
+                    self.stop_tracking()
                         
-            except KeyboardInterrupt:
-                print("\n🛑 Stopping Shortcut Coach...")
-                self.stop_tracking()
-                print("✅ Tracking stopped successfully")
             except Exception as e:
                 print(f"❌ Error in main tracking loop: {e}")
                 self.stop_tracking()
@@ -258,10 +241,33 @@ class ShortcutCoach:
             print("This might be due to permission issues or system restrictions.")
             sys.exit(1)
     
+    def poll_window(self):
+        """Log window changes and refresh the foreground snapshot (window timer slot)"""
+        window_title, app_name = self.window_monitor.check_window_change()
+        if window_title:
+            logger.debug("🖥️ Active Window: %s - %s", app_name, window_title)
+        
+        # Refresh the foreground snapshot used to attribute key events
+        self.foreground = self.ui_manager.get_foreground_snapshot()
+    
+    def _on_interrupt(self, signum, frame):
+        """Handle Ctrl+C while the Qt event loop is running"""
+        print("\n🛑 Stopping Shortcut Coach...")
+        self.stop_tracking()
+        print("✅ Tracking stopped successfully")
+    
     def stop_tracking(self):
         """Stop all tracking"""
         self.running = False
+        self.window_timer.stop()
         self.input_monitor.stop()
+        self.click_worker.stop()
+        self.ui_manager.stop()
+        # Write whatever is still queued (including the final typing burst)
+        self.event_writer.stop()
+        self.db_manager.close()
+        # The GUI may still be open (Ctrl+C); stop its query thread before Qt exits
+        self.gui.shutdown()
         self.notification_system.stop()
         if self.qt_app:
             self.qt_app.quit()
@@ -8,10 +8,18 @@ import sqlite3
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import re
+import functools
+
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse an event's ISO timestamp; cached since each event is compared as both current and last"""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
 
 class Process:
     """Represents a user process/workflow"""
     
+    __slots__ = ("id", "start_time", "end_time", "context", "actions", "frequency")
+    
     def __init__(self, process_id: str, start_time: datetime, context: str = ""):
         self.id = process_id
         self.start_time = start_time
@@ -115,6 +123,9 @@ class Process:
                     has_enter = True
                 elif len(details) == 1 and details.isprintable():
                     text_chars.append(details)
+            elif event_type == 'Key Sequence':
+                # Coalesced typing burst - one event holds several characters
+                text_chars.extend(ch for ch in details if ch.isprintable())
                     
         # If we have text and enter, this is a text input
         if text_chars and has_enter:
@@ -133,6 +144,8 @@ class Process:
             if (action.get('event_type') == 'Key Press' and 
                 action.get('details') in ['c', 'd', ' ', '\\', '/', '.']):
                 cd_sequence.append(action.get('details'))
+            elif action.get('event_type') == 'Key Sequence':
+                cd_sequence.extend(ch for ch in action.get('details', '') if ch in 'cd \\/.')
                 
         if len(cd_sequence) >= 3 and cd_sequence[0] == 'c' and cd_sequence[1] == 'd':
             # Extract the path
@@ -194,8 +207,8 @@ class DataProcessor:
         # Time gap > threshold
         if last_event.get('timestamp'):
             try:
-                last_time = datetime.fromisoformat(last_event['timestamp'].replace('Z', '+00:00'))
-                current_time = datetime.fromisoformat(current_event['timestamp'].replace('Z', '+00:00'))
+                last_time = parse_timestamp(last_event['timestamp'])
+                current_time = parse_timestamp(current_event['timestamp'])
                 time_diff = (current_time - last_time).total_seconds()
                 
                 # Special handling for text input sequences
@@ -203,10 +216,7 @@ class DataProcessor:
                     # After enter, wait a bit longer to see if more text comes
                     if time_diff > self.text_input_delay:
                         return True
-                elif (last_event.get('event_type') == 'Key Press' and 
-                      current_event.get('event_type') == 'Key Press' and
-                      len(last_event.get('details', '')) == 1 and 
-                      len(current_event.get('details', '')) == 1):
+                elif self._is_typing(last_event) and self._is_typing(current_event):
                     # Between keystrokes, use typing threshold (more lenient)
                     if time_diff > self.typing_threshold:
                         return True
@@ -237,6 +247,13 @@ class DataProcessor:
             
         return False
         
+    def _is_typing(self, event: Dict) -> bool:
+        """Check if an event is a typed character or a coalesced typing burst"""
+        event_type = event.get('event_type')
+        if event_type == 'Key Sequence':
+            return True
+        return event_type == 'Key Press' and len(event.get('details', '')) == 1
+        
     def _is_significant_title_change(self, current: str, last: str) -> bool:
         """Check if window title change is significant"""
         if not current or not last:
@@ -280,7 +297,7 @@ class DataProcessor:
                 # End current process if exists
                 if self.current_process:
                     self.current_process.end_process(
-                        datetime.fromisoformat(last_event['timestamp'].replace('Z', '+00:00'))
+                        parse_timestamp(last_event['timestamp'])
                         if last_event and last_event.get('timestamp') else datetime.now()
                     )
                     self.processes.append(self.current_process)
@@ -289,7 +306,7 @@ class DataProcessor:
                 process_id = f"process_{len(self.processes)}_{datetime.now().strftime('%H%M%S')}"
                 context = event.get('app_name', 'Unknown')
                 self.current_process = Process(process_id, 
-                                            datetime.fromisoformat(event['timestamp'].replace('Z', '+00:00'))
+                                            parse_timestamp(event['timestamp'])
                                             if event.get('timestamp') else datetime.now(),
                                             context)
                                             
@@ -302,7 +319,7 @@ class DataProcessor:
         # End the last process
         if self.current_process:
             self.current_process.end_process(
-                datetime.fromisoformat(last_event['timestamp'].replace('Z', '+00:00'))
+                parse_timestamp(last_event['timestamp'])
                 if last_event and last_event.get('timestamp') else datetime.now()
             )
             self.processes.append(self.current_process)
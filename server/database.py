@@ -1,10 +1,15 @@
 import sqlite3
 import time
+import threading
 from datetime import datetime
 
 class DatabaseManager:
     def __init__(self, db_path='shortcuts.db'):
         self.db_path = db_path
+        # One long-lived connection for all inserts (opened on first write)
+        self._write_conn = None
+        self._write_lock = threading.Lock()
+        self._closed = False  # set by close(); later writes are dropped, not reopened
         self.init_database()
     
     def init_database(self):
@@ -13,6 +18,10 @@ class DatabaseManager:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
+            # WAL lets the GUI's readers run alongside batched writes and makes
+            # each commit a cheap log append (the mode persists in the file)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Create events table if it doesn't exist
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS events (
@@ -33,22 +42,59 @@ class DatabaseManager:
         except Exception as e:
             print(f"❌ Database initialization error: {e}")
     
+    def _writer(self):
+        """Return the shared write connection, opening and tuning it on first use"""
+        if self._write_conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # In WAL mode NORMAL only syncs at checkpoints, so commits skip the fsync
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._write_conn = conn
+        return self._write_conn
+    
     def log_event(self, event_type, details="", window_title="", app_name="", context_action=""):
         """Log an event to the database"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO events (event_type, details, window_title, app_name, context_action, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (event_type, details, window_title, app_name, context_action, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"❌ Error logging event: {e}")
+        self.log_events_batch([
+            (event_type, details, window_title, app_name, context_action, datetime.now().isoformat())
+        ])
+    
+    def log_events_batch(self, rows):
+        """Insert already-timestamped events with one executemany and one commit.
+        
+        Each row is (event_type, details, window_title, app_name, context_action, timestamp).
+        """
+        if not rows:
+            return
+        with self._write_lock:
+            if self._closed:
+                print(f"⚠️ Dropped {len(rows)} events logged after the database was closed")
+                return
+            conn = None
+            try:
+                conn = self._writer()
+                conn.executemany('''
+                    INSERT INTO events (event_type, details, window_title, app_name, context_action, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+                
+            except Exception as e:
+                # Undo a partly inserted batch so it isn't committed with the next one
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except sqlite3.Error:
+                        pass
+                print(f"❌ Error logging events: {e}")
+    
+    def close(self):
+        """Close the shared write connection; events logged afterwards are dropped"""
+        with self._write_lock:
+            self._closed = True
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
     
     def get_recent_events(self, limit=100):
         """Get recent events from database"""
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Debug Logging for Shortcut Coach
+Per-event trace output for the input paths, written off the input threads
+"""
+
+import os
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# Trace messages are off by default; calls below the level return after one
+# level check, without formatting. Set SHORTCUT_COACH_DEBUG=1 or call
+# set_debug(True) (Ctrl+Shift+D in the main window) to see them.
+logger = logging.getLogger("shortcut_coach")
+logger.propagate = False
+
+# Records are handed to a background thread, so input callbacks never
+# block on console I/O
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def set_debug(enabled):
+    """Turn per-event trace output on or off"""
+    logger.setLevel(logging.DEBUG if enabled else logging.WARNING)
+
+
+def debug_enabled():
+    """Return True if per-event trace output is on"""
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+set_debug(os.environ.get("SHORTCUT_COACH_DEBUG") == "1")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Event Writer for Shortcut Coach
+Queues logged events and writes them to the database in batches on a background thread
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+
+# Queued events beyond this wake the writer thread instead of waiting for its next tick
+MAX_PENDING_EVENTS = 50
+
+
+class EventWriter:
+    """Batches event rows from any thread into one database transaction per tick"""
+    
+    __slots__ = ("db_manager", "on_written", "pending_events", "wakeup", "running", "thread")
+    
+    def __init__(self, db_manager, on_written):
+        self.db_manager = db_manager
+        self.on_written = on_written  # called after each batch is written
+        
+        # Input threads only append (deque appends and pops are thread safe); the
+        # writer thread drains them as one batch every 100ms, or sooner once more
+        # than MAX_PENDING_EVENTS pile up
+        self.pending_events = deque()
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = threading.Thread(target=self._write_events_loop, daemon=True)
+    
+    def start(self):
+        """Start the writer thread"""
+        self.running = True
+        self.thread.start()
+    
+    def stop(self):
+        """Stop the writer thread, then write whatever is still queued"""
+        if self.running:
+            self.running = False
+            self.wakeup.set()
+            self.thread.join()
+        self.flush()
+    
+    def enqueue(self, rows):
+        """Timestamp rows now and queue them; wake the writer early if the queue is long"""
+        timestamp = datetime.now().isoformat()
+        self.pending_events.extend((*row, timestamp) for row in rows)
+        if len(self.pending_events) > MAX_PENDING_EVENTS:
+            self.wakeup.set()
+    
+    def _write_events_loop(self):
+        """Writer thread: flush queued events every 100ms until stopped"""
+        while self.running:
+            self.wakeup.wait(0.1)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Error writing events: {e}")
+    
+    def flush(self):
+        """Write all queued events in one transaction and report it"""
+        rows = []
+        pending = self.pending_events
+        try:
+            while True:
+                rows.append(pending.popleft())
+        except IndexError:
+            pass
+        
+        if rows:
+            self.db_manager.log_events_batch(rows)
+            self.on_written()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Foreground Watcher for Shortcut Coach
+Tracks the foreground window through a WinEvent hook instead of polling,
+and answers foreground app and title queries for the UI automation manager
+"""
+
+import time
+import ctypes
+import ctypes.wintypes
+import threading
+import psutil
+from win32gui import GetForegroundWindow, GetWindowText
+from win32process import GetWindowThreadProcessId
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None, ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD, ctypes.wintypes.HWND,
+    ctypes.wintypes.LONG, ctypes.wintypes.LONG, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD
+)
+
+# Private DLL handles so these prototypes don't clash with other ctypes users
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+user32.SetWinEventHook.restype = ctypes.wintypes.HANDLE
+user32.SetWinEventHook.argtypes = (
+    ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.HMODULE, WinEventProc,
+    ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD
+)
+user32.UnhookWinEvent.argtypes = (ctypes.wintypes.HANDLE,)
+user32.GetForegroundWindow.restype = ctypes.wintypes.HWND
+user32.PostThreadMessageW.argtypes = (
+    ctypes.wintypes.DWORD, ctypes.wintypes.UINT, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM
+)
+
+
+# Recent process names: pid -> (monotonic time looked up, app name). Entries expire
+# so a PID reused by a new process picks up its new name
+_pid_names = {}
+PID_NAME_TTL = 5.0
+PID_NAME_MAX = 64
+
+
+def process_name(pid):
+    """App name (executable without .exe) for a PID; cached since psutil opens a handle per lookup"""
+    now = time.monotonic()
+    hit = _pid_names.get(pid)
+    if hit and now - hit[0] < PID_NAME_TTL:
+        return hit[1]
+
+    name = psutil.Process(pid).name()
+    name = name.replace(".exe", "") if name else "Unknown"
+    if len(_pid_names) >= PID_NAME_MAX:
+        _pid_names.clear()
+    _pid_names[pid] = (now, name)
+    return name
+
+
+class ForegroundWatcher:
+    """Keeps the current foreground (hwnd, pid), updated by Windows on each focus change
+
+    The hooks run on their own thread with a message loop, since out-of-context
+    WinEvent callbacks are delivered through the installing thread's messages.
+    Until start() succeeds, current() returns None and foreground_info() and
+    the wait helpers fall back to polling. Title changes are hooked only for
+    the foreground process, re-registered whenever it changes.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._current = None  # (hwnd, pid) while the hook is running
+        self._seq = 0  # bumped on every foreground change
+        self._thread = None
+        self._thread_id = None
+        # Kept referenced for as long as the hooks are installed
+        self._proc = WinEventProc(self._on_foreground)
+        self._name_proc = WinEventProc(self._on_name_change)
+        self._name_hook = None
+        self._name_hook_pid = 0
+        self._title_hwnd = None  # window whose title a caller is waiting on
+        self._title_changed = threading.Event()
+
+    def start(self):
+        """Install the hook on a background thread (no-op if already started)"""
+        if self._thread is not None:
+            return
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,),
+                                        name="foreground-watcher", daemon=True)
+        self._thread.start()
+        started.wait(timeout=1.0)
+
+    def stop(self):
+        """Remove the hook and end its thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        if self._thread_id:
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        thread.join(timeout=1.0)
+        self._thread = None
+        with self._changed:
+            self._current = None
+            self._seq += 1
+            self._changed.notify_all()
+
+    def current(self):
+        """Return (hwnd, pid, seq) for the foreground window, or None if the hook is not running"""
+        with self._changed:
+            if self._current is None:
+                return None
+            return self._current + (self._seq,)
+
+    def wait_for_change(self, seq, timeout):
+        """Block until the foreground differs from the reading numbered seq; False on timeout"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._seq != seq, timeout)
+
+    def wait_for_title(self, hwnd, timeout, quiet=0.04):
+        """Wait until hwnd's title changes and then stays put for quiet seconds, or timeout
+
+        Returns False right away if title changes of hwnd aren't hooked, so the
+        caller can poll instead.
+        """
+        with self._changed:
+            if self._name_hook is None or self._current is None or self._current[0] != hwnd:
+                return False
+            self._title_hwnd = hwnd
+            self._title_changed.clear()
+        deadline = time.monotonic() + timeout
+        try:
+            if self._title_changed.wait(timeout):
+                # Pages often rename a tab several times in a row; wait for the last one
+                while True:
+                    self._title_changed.clear()
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._title_changed.wait(min(quiet, remaining)):
+                        break
+        finally:
+            self._title_hwnd = None
+        return True
+
+    def wait_for_title_settle(self, hwnd, timeout=0.5, step=0.04):
+        """Wait for the window title to change and settle, or timeout"""
+        if self.wait_for_title(hwnd, timeout, quiet=step):
+            return GetWindowText(hwnd) or ""
+
+        # No title hook for this window; poll GetWindowText instead
+        t0 = time.time()
+        last = GetWindowText(hwnd) or ""
+        while time.time() - t0 < timeout:
+            time.sleep(step)
+            cur = GetWindowText(hwnd) or ""
+            if cur != last:
+                # confirm stability with one extra read
+                time.sleep(step)
+                cur2 = GetWindowText(hwnd) or ""
+                if cur2 == cur:
+                    return cur
+                last = cur2
+        return last
+
+    def foreground_info(self, settle_for_chrome=True):
+        """Return (app_name, window_title, hwnd) for current foreground window"""
+        try:
+            reading = self.current()
+            if reading is not None:
+                hwnd, pid, _ = reading
+            else:
+                hwnd = GetForegroundWindow()
+                pid = GetWindowThreadProcessId(hwnd)[1] if hwnd else 0
+            if not hwnd:
+                return ("Unknown", "Unknown", None)
+            app_name = process_name(pid) if pid else "Unknown"
+            if app_name.lower() == "chrome" and settle_for_chrome:
+                title = self.wait_for_title_settle(hwnd)
+            else:
+                title = GetWindowText(hwnd) or "Unknown"
+            return (app_name, title, hwnd)
+        except Exception:
+            return ("Unknown", "Unknown", None)
+
+    def wait_for_foreground_targets(self, targets, timeout=0.5, step=0.02):
+        """
+        Wait until the foreground app name lower() is in targets.
+        If Chrome becomes foreground, also wait for tab title to settle.
+        Returns (app_name, window_title, hwnd). Falls back to last reading on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            # Read the sequence number first so a change during the lookup isn't missed
+            reading = self.current()
+            app, title, hwnd = self.foreground_info(settle_for_chrome=False)
+            last = (app, title, hwnd)
+            if app.lower() in targets:
+                # If Chrome, settle the title before returning
+                if app.lower() == "chrome" and hwnd:
+                    settled_title = self.wait_for_title_settle(hwnd)
+                    return (app, settled_title, hwnd)
+                return (app, title, hwnd)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if reading is not None:
+                # Sleep until the hook reports a different foreground window
+                self.wait_for_change(reading[2], remaining)
+            else:
+                time.sleep(min(step, remaining))
+        # Timeout, return last seen
+        app, title, hwnd = last
+        if app.lower() == "chrome" and hwnd:
+            title = self.wait_for_title_settle(hwnd)
+        return (app, title, hwnd)
+
+    def _hook_name_changes(self, pid):
+        """Move the title hook to pid (runs on the hook thread)"""
+        if pid == self._name_hook_pid:
+            return
+        if self._name_hook:
+            user32.UnhookWinEvent(self._name_hook)
+            self._name_hook = None
+        self._name_hook_pid = pid
+        if pid:
+            self._name_hook = user32.SetWinEventHook(
+                EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, None, self._name_proc,
+                pid, 0, WINEVENT_OUTOFCONTEXT
+            ) or None
+
+    def _set_foreground(self, hwnd):
+        pid = GetWindowThreadProcessId(hwnd)[1] if hwnd else 0
+        self._hook_name_changes(pid)
+        with self._changed:
+            self._current = (hwnd, pid)
+            self._seq += 1
+            self._changed.notify_all()
+
+    def _on_foreground(self, hook, event, hwnd, id_object, id_child, event_thread, event_time):
+        try:
+            self._set_foreground(hwnd)
+        except Exception:
+            pass  # Never let an exception escape into the hook callback
+
+    def _on_name_change(self, hook, event, hwnd, id_object, id_child, event_thread, event_time):
+        # Only the window's own caption, not names of controls inside it
+        if id_object == OBJID_WINDOW and hwnd and hwnd == self._title_hwnd:
+            self._title_changed.set()
+
+    def _run(self, started):
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hook = user32.SetWinEventHook(EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+                                      None, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT)
+        if not hook:
+            # Leave current() at None so callers fall back to polling
+            started.set()
+            return
+
+        self._set_foreground(user32.GetForegroundWindow())
+        started.set()
+
+        msg = ctypes.wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        self._hook_name_changes(0)
+        user32.UnhookWinEvent(hook)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Glass Pixels for Shortcut Coach
+NumPy (and optional Numba) pixel helpers for the liquid glass notification backdrop
+"""
+
+import numpy as np
+from PyQt6.QtGui import QImage
+
+
+def pixel_view(img: QImage, writable=False):
+    """(h, w, 4) uint8 BGRA view of a 32-bit QImage's pixel buffer, without copying
+
+    constBits() is used for reads so Qt does not detach (deep copy) the image.
+    """
+    ptr = img.bits() if writable else img.constBits()
+    ptr.setsize(img.sizeInBytes())
+    arr = np.frombuffer(ptr, dtype=np.uint8)
+    return arr.reshape(img.height(), img.bytesPerLine() // 4, 4)[:, :img.width()]
+
+
+def box4_average(pixels):
+    """Average each pixel with its right, lower and lower-right neighbours (edges clamped)"""
+    p = np.pad(pixels, ((0, 1), (0, 1), (0, 0)), mode="edge").astype(np.uint16)
+    return ((p[:-1, :-1] + p[1:, :-1] + p[:-1, 1:] + p[1:, 1:]) >> 2).astype(np.uint8)
+
+
+# Optional: fused, multi-core brightness/contrast pass via Numba
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def bc_kernel(src, dst, lut):
+        """Apply a brightness/contrast LUT to BGRA pixels in one loop, without temporary arrays"""
+        h, w = src.shape[0], src.shape[1]
+        for y in prange(h):
+            for x in range(w):
+                for ch in range(3):
+                    dst[y, x, ch] = lut[src[y, x, ch]]
+                dst[y, x, 3] = src[y, x, 3]
+
+    # Compile now, at import, for the strided (read-only source) views pixel_view
+    # returns, so the first backdrop refresh does not pay for the JIT
+    _warm_src = np.zeros((1, 2, 4), dtype=np.uint8)[:, :1]
+    _warm_src.flags.writeable = False
+    bc_kernel(_warm_src, np.zeros((1, 2, 4), dtype=np.uint8)[:, :1], np.arange(256, dtype=np.uint8))
+    del _warm_src
+else:
+    bc_kernel = None
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+GUI Constants for Shortcut Coach
+Stylesheet, fixed texts and live-data queries used by the GUI
+"""
+
+
+# Dark theme, applied once to the QApplication
+DARK_THEME_STYLESHEET = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QTabWidget::pane {
+        border: 1px solid #3c3c3c;
+        background-color: #2b2b2b;
+    }
+    QTabBar::tab {
+        background-color: #3c3c3c;
+        color: #ffffff;
+        padding: 8px 16px;
+        margin-right: 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+    QTabBar::tab:selected {
+        background-color: #0078d4;
+    }
+    QTableView {
+        background-color: #1e1e1e;
+        color: #ffffff;
+        gridline-color: #3c3c3c;
+        border: none;
+    }
+    QHeaderView::section {
+        background-color: #3c3c3c;
+        color: #ffffff;
+        padding: 8px;
+        border: none;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        color: #ffffff;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #106ebe;
+    }
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+    QTextEdit {
+        background-color: #1e1e1e;
+        color: #ffffff;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+    }
+    QLabel {
+        color: #ffffff;
+    }
+    QProgressBar {
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #0078d4;
+        border-radius: 3px;
+    }
+"""
+
+# Fixed texts for the AI suggestions tab
+SUGGESTIONS_LOADING = "🤖 Analyzing your behavior patterns...\n\nPlease wait while the AI generates personalized suggestions..."
+
+SUGGESTIONS_NO_DATA = """
+🤖 No Data Yet
+
+Start using your computer to collect data for AI-powered insights!
+
+💡 The system will analyze:
+• Your most frequent actions
+• Application switching patterns
+• Missed shortcut opportunities
+• Time-saving workflow suggestions
+"""
+
+SUGGESTIONS_BASIC_TEMPLATE = """
+🤖 Basic Analysis (AI Unavailable)
+
+Based on your recent activity:
+
+📊 Statistics:
+• Total Events: {total_events}
+• Applications Used: {unique_apps}
+
+💡 The AI analysis is currently unavailable. Try again later!
+"""
+
+SUGGESTIONS_ERROR_TEMPLATE = """
+🤖 Analysis Error
+
+Could not generate AI suggestions: {error}
+
+💡 Make sure Ollama is running and try again.
+"""
+
+
+# Live-data queries, run on the query worker thread (all take gui_start_time)
+GUI_QUERIES = {
+    # Events that happened AFTER the GUI was opened
+    "live_tracker": """
+        SELECT timestamp, event_type, details, app_name
+        FROM events 
+        WHERE timestamp > ?
+        ORDER BY timestamp DESC 
+        LIMIT 50
+    """,
+    # Application usage statistics only from after GUI was opened
+    "time_tracker": """
+        SELECT 
+            app_name,
+            COUNT(*) as events,
+            MIN(timestamp) as first_seen,
+            MAX(timestamp) as last_seen
+        FROM events 
+        WHERE app_name != 'Unknown' AND timestamp > ?
+        GROUP BY app_name
+        ORDER BY events DESC
+    """,
+    # Missed shortcut opportunities only from after GUI was opened
+    "shortcut_opportunities": """
+        SELECT 
+            context_action,
+            COUNT(*) as frequency
+        FROM events 
+        WHERE (context_action LIKE 'SHORTCUT_%' 
+           OR context_action LIKE '%copy%' 
+           OR context_action LIKE '%paste%'
+           OR context_action LIKE '%cut%'
+           OR context_action LIKE '%save%'
+           OR context_action LIKE '%new%'
+           OR context_action LIKE '%open%'
+           OR context_action LIKE '%undo%'
+           OR context_action LIKE '%redo%'
+           OR context_action LIKE '%find%'
+           OR context_action LIKE '%print%'
+           OR context_action LIKE '%arrow%'
+           OR context_action LIKE '%space%'
+           OR context_action LIKE '%tab%'
+           OR context_action LIKE '%f5%'
+           OR context_action LIKE '%alt%')
+           AND timestamp > ?
+        GROUP BY context_action
+        ORDER BY frequency DESC
+    """
+}
@@ -5,16 +5,31 @@ Handles all PyQt6 GUI functionality and UI components
 """
 
 import sqlite3
+import threading
 from datetime import datetime
 from PyQt6.QtWidgets import (
-    QMainWindow, QTabWidget, QWidget, QVBoxLayout,
-    QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QTextEdit,
+    QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout,
+    QHBoxLayout, QLabel, QTableView, QTextEdit,
     QPushButton, QProgressBar, QGroupBox, QScrollArea
 )
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QFont, QPalette, QColor
-from shortcut_manager import ShortcutManager
+from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QFont, QPalette, QColor, QShortcut, QKeySequence
+from shortcut_manager import get_default_shortcut_manager
 from ollama_manager import OllamaManager
+from gui_models import RowsTableModel
+from gui_worker import QueryWorker
+from gui_constants import (
+    DARK_THEME_STYLESHEET, SUGGESTIONS_LOADING, SUGGESTIONS_NO_DATA,
+    SUGGESTIONS_BASIC_TEMPLATE, SUGGESTIONS_ERROR_TEMPLATE, GUI_QUERIES
+)
+from debug_log import set_debug, debug_enabled
+
+def clock_time(timestamp):
+    """HH:MM:SS part of a stored ISO timestamp (other values pass through unchanged)"""
+    if timestamp and len(timestamp) >= 19 and timestamp[13] == ":":
+        return timestamp[11:19]
+    return timestamp
+
 
 class DataCollector:
     """Simple data collector for the GUI"""
@@ -31,6 +46,11 @@ class DataCollector:
         self.running = False
 
 class ShortcutCoachGUI(QMainWindow):
+    # Emitted (from any thread) after new events are written to the database
+    data_changed = pyqtSignal()
+    # (query name, sql, params) handed to the query worker thread
+    query_requested = pyqtSignal(str, str, object)
+    
     def __init__(self, shortcut_coach):
         super().__init__()
         self.shortcut_coach = shortcut_coach
@@ -50,91 +70,53 @@ class ShortcutCoachGUI(QMainWindow):
         self.gui_start_time = datetime.now().isoformat()
         print(f"🕐 GUI opened at: {self.gui_start_time}")
         
-        # Set up automatic refresh timer for live data
+        # Database reads for live data run on a worker thread so queries never block painting
+        self._query_in_flight = False
+        self._shut_down = False
+        self._query_handlers = {
+            "live_tracker": self.update_live_tracker,
+            "time_tracker": self.update_time_tracker,
+            "shortcut_opportunities": self.update_shortcut_opportunities
+        }
+        self.query_thread = QThread()
+        self.query_worker = QueryWorker(shortcut_coach.db_manager.db_path)
+        self.query_worker.moveToThread(self.query_thread)
+        self.query_requested.connect(self.query_worker.run_query)
+        self.query_worker.results_ready.connect(self._on_query_results)
+        self.query_thread.start()
+        
+        # Set up automatic refresh timer for live data; ticks only do work when
+        # new events were logged, so bursts collapse into one refresh per tick
+        self._dirty = True
+        self.data_changed.connect(self._mark_dirty)
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_live_data)
-        self.refresh_timer.start(1000)  # Refresh every 1000ms (1 second)
+        self.refresh_timer.start(250)  # At most one refresh every 250ms
         
         # Initialize central shortcut manager for consistent shortcut mapping
-        self.shortcut_manager = ShortcutManager()
+        self.shortcut_manager = get_default_shortcut_manager()
         
         # Initialize Ollama manager for AI suggestions
         self.ollama_manager = OllamaManager()
         
+        # Read-only connection for on-demand queries (AI suggestions)
+        self._db_lock = threading.Lock()
+        self._ro_conn = sqlite3.connect(
+            f"file:{shortcut_coach.db_manager.db_path}?mode=ro",
+            uri=True, check_same_thread=False
+        )
+        self._ro_conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        self._ro_conn.execute("PRAGMA mmap_size=268435456")
+        
+    def _query(self, sql, params=()):
+        """Run a read query on the shared connection and return all rows"""
+        with self._db_lock:
+            return self._ro_conn.execute(sql, params).fetchall()
+        
     def set_dark_theme(self):
         """Apply modern dark theme"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QTabWidget::pane {
-                border: 1px solid #3c3c3c;
-                background-color: #2b2b2b;
-            }
-            QTabBar::tab {
-                background-color: #3c3c3c;
-                color: #ffffff;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background-color: #0078d4;
-            }
-            QTableWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-                gridline-color: #3c3c3c;
-                border: none;
-            }
-            QHeaderView::section {
-                background-color: #3c3c3c;
-                color: #ffffff;
-                padding: 8px;
-                border: none;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #ffffff;
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QProgressBar {
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d4;
-                border-radius: 3px;
-            }
-        """)
+        # Applied application-wide so the parsed sheet is shared by every widget
+        QApplication.instance().setStyleSheet(DARK_THEME_STYLESHEET)
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -149,12 +131,25 @@ class ShortcutCoachGUI(QMainWindow):
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
         
-        # Create tabs
+        # Create tabs (tabs with live data register the query that fills them)
+        self._tab_queries = {}
         self.create_live_tracker_tab()
         self.create_time_tracker_tab()
         self.create_shortcut_opportunities_tab()
         self.create_ai_suggestions_tab()
         
+        # Refresh right away when switching tabs, since hidden tabs are not kept current
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        
+        # Ctrl+Shift+D toggles per-event debug output on the console
+        self.debug_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.debug_shortcut.activated.connect(self.toggle_debug_output)
+        
+    def toggle_debug_output(self):
+        """Turn per-event debug output on or off"""
+        set_debug(not debug_enabled())
+        print(f"🐞 Debug output {'ON' if debug_enabled() else 'OFF'}")
+        
     def create_live_tracker_tab(self):
         """Create the live tracker tab"""
         tab = QWidget()
@@ -171,16 +166,17 @@ class ShortcutCoachGUI(QMainWindow):
         layout.addWidget(desc)
         
         # Live data table
-        self.live_table = QTableWidget()
-        self.live_table.setColumnCount(4)
-        self.live_table.setHorizontalHeaderLabels([
+        self.live_model = RowsTableModel([
             "Timestamp", "Event Type", "Details", "Application"
         ])
+        self.live_table = QTableView()
+        self.live_table.setModel(self.live_model)
         self.live_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.live_table)
         
         # Add tab
         self.tab_widget.addTab(tab, "🔴 Live Tracker")
+        self._tab_queries[tab] = "live_tracker"
         
     def create_time_tracker_tab(self):
         """Create the time tracker tab"""
@@ -198,16 +194,17 @@ class ShortcutCoachGUI(QMainWindow):
         layout.addWidget(desc)
         
         # Time tracking table
-        self.time_table = QTableWidget()
-        self.time_table.setColumnCount(4)
-        self.time_table.setHorizontalHeaderLabels([
+        self.time_model = RowsTableModel([
             "Application", "Time Spent", "Events", "Last Seen"
         ])
+        self.time_table = QTableView()
+        self.time_table.setModel(self.time_model)
         self.time_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.time_table)
         
         # Add tab
         self.tab_widget.addTab(tab, "⏱️ Time Tracker")
+        self._tab_queries[tab] = "time_tracker"
         
     def create_shortcut_opportunities_tab(self):
         """Create the shortcut opportunities tab"""
@@ -225,16 +222,17 @@ class ShortcutCoachGUI(QMainWindow):
         layout.addWidget(desc)
         
         # Opportunities table
-        self.opportunities_table = QTableWidget()
-        self.opportunities_table.setColumnCount(2)
-        self.opportunities_table.setHorizontalHeaderLabels([
+        self.opportunities_model = RowsTableModel([
             "Shortcut", "Counter"
         ])
+        self.opportunities_table = QTableView()
+        self.opportunities_table.setModel(self.opportunities_model)
         self.opportunities_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.opportunities_table)
         
         # Add tab
         self.tab_widget.addTab(tab, "⌨️ Shortcuts")
+        self._tab_queries[tab] = "shortcut_opportunities"
         
     def create_ai_suggestions_tab(self):
         """Create the AI suggestions tab"""
@@ -253,6 +251,7 @@ class ShortcutCoachGUI(QMainWindow):
         
         # Suggestions text area
         self.suggestions_text = QTextEdit()
+        self._last_suggestions = None
         self.suggestions_text.setPlaceholderText("AI suggestions will appear here as you use the system...")
         # Set larger font for better readability
         font = QFont("Arial", 14)  # Increased from default to 14pt
@@ -267,150 +266,77 @@ class ShortcutCoachGUI(QMainWindow):
         # Add tab
         self.tab_widget.addTab(tab, "🤖 AI Suggestions")
         
+    def _mark_dirty(self):
+        """Note that new events are waiting to be shown"""
+        self._dirty = True
+    
+    def _on_tab_changed(self, index):
+        """Refresh the newly shown tab (the worker skips it if nothing changed)"""
+        self._mark_dirty()
+        self.refresh_live_data()
+    
     def refresh_live_data(self):
-        """Refresh live data in all tabs"""
-        try:
-            self.refresh_live_tracker()
-            self.refresh_time_tracker()
-            self.refresh_shortcut_opportunities()
-        except Exception as e:
-            print(f"Error refreshing GUI data: {e}")
+        """Timer tick: refresh the visible tab if new events were logged"""
+        if self._dirty and self._refresh_current_tab():
+            self._dirty = False
+    
+    def _refresh_current_tab(self):
+        """Ask the worker to refresh the tab on screen; False if that has to wait"""
+        # Nothing to do while the window is hidden or minimized
+        if self.isMinimized() or not self.isVisible():
+            return False
+        
+        # Only one query in flight at a time; try again on the next tick
+        if self._query_in_flight:
+            return False
+        
+        query_name = self._tab_queries.get(self.tab_widget.currentWidget())
+        if query_name:
+            self._query_in_flight = True
+            self.query_requested.emit(query_name, GUI_QUERIES[query_name], (self.gui_start_time,))
+        return True
+    
+    def _on_query_results(self, name, rows):
+        """Apply rows delivered by the query worker to their table"""
+        self._query_in_flight = False
+        if rows is not None:
+            self._query_handlers[name](rows)
             
-    def refresh_live_tracker(self):
-        """Refresh the live tracker tab with recent events"""
+    def update_live_tracker(self, events):
+        """Show recent events in the live tracker tab"""
         try:
-            conn = sqlite3.connect('shortcuts.db')
-            cursor = conn.cursor()
-            
-            # Get only events that happened AFTER the GUI was opened
-            cursor.execute("""
-                SELECT timestamp, event_type, details, app_name
-                FROM events 
-                WHERE timestamp > ?
-                ORDER BY timestamp DESC 
-                LIMIT 50
-            """, (self.gui_start_time,))
-            
-            events = cursor.fetchall()
-            conn.close()
-            
-            # Update table
-            self.live_table.setRowCount(len(events))
-            for i, event in enumerate(events):
-                for j, value in enumerate(event):
-                    # Format timestamp to show only time (HH:MM:SS)
-                    if j == 0 and value:  # First column is timestamp
-                        try:
-                            # Parse ISO timestamp and extract time
-                            timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                            formatted_time = timestamp.strftime("%H:%M:%S")
-                            item = QTableWidgetItem(formatted_time)
-                        except:
-                            item = QTableWidgetItem(str(value) if value else "")
-                    else:
-                        item = QTableWidgetItem(str(value) if value else "")
-                    self.live_table.setItem(i, j, item)
+            rows = []
+            for timestamp, event_type, details, app_name in events:
+                rows.append((clock_time(timestamp), event_type, details, app_name))
+            self.live_model.set_rows(rows)
                     
         except Exception as e:
             print(f"Error refreshing live tracker: {e}")
             
-    def refresh_time_tracker(self):
-        """Refresh the time tracker tab with application usage data"""
+    def update_time_tracker(self, apps):
+        """Show application usage data in the time tracker tab"""
         try:
-            conn = sqlite3.connect('shortcuts.db')
-            cursor = conn.cursor()
-            
-            # Get application usage statistics only from after GUI was opened
-            cursor.execute("""
-                SELECT 
-                    app_name,
-                    COUNT(*) as events,
-                    MIN(timestamp) as first_seen,
-                    MAX(timestamp) as last_seen
-                FROM events 
-                WHERE app_name != 'Unknown' AND timestamp > ?
-                GROUP BY app_name
-                ORDER BY events DESC
-            """, (self.gui_start_time,))
-            
-            apps = cursor.fetchall()
-            conn.close()
-            
-            # Update table
-            self.time_table.setRowCount(len(apps))
-            for i, app in enumerate(apps):
+            rows = []
+            for app in apps:
                 app_name = app[0] or "Unknown"
                 events = app[1]
-                first_seen = app[2] or "Unknown"
-                last_seen = app[3] or "Unknown"
+                last_seen = clock_time(app[3]) or "Unknown"
                 
                 # Calculate time spent (simplified)
                 time_spent = f"{events} events"
                 
-                # Format timestamps to show only time
-                try:
-                    if first_seen != "Unknown":
-                        first_timestamp = datetime.fromisoformat(first_seen.replace('Z', '+00:00'))
-                        first_formatted = first_timestamp.strftime("%H:%M:%S")
-                    else:
-                        first_formatted = "Unknown"
-                        
-                    if last_seen != "Unknown":
-                        last_timestamp = datetime.fromisoformat(last_seen.replace('Z', '+00:00'))
-                        last_formatted = last_timestamp.strftime("%H:%M:%S")
-                    else:
-                        last_formatted = "Unknown"
-                except:
-                    first_formatted = first_seen
-                    last_formatted = last_seen
-                
-                self.time_table.setItem(i, 0, QTableWidgetItem(app_name))
-                self.time_table.setItem(i, 1, QTableWidgetItem(time_spent))
-                self.time_table.setItem(i, 2, QTableWidgetItem(str(events)))
-                self.time_table.setItem(i, 3, QTableWidgetItem(last_formatted))
+                rows.append((app_name, time_spent, events, last_seen))
+            self.time_model.set_rows(rows)
                 
         except Exception as e:
             print(f"Error refreshing time tracker: {e}")
             
-    def refresh_shortcut_opportunities(self):
-        """Refresh the shortcut opportunities tab"""
+    def update_shortcut_opportunities(self, opportunities):
+        """Show missed shortcut opportunities in the shortcuts tab"""
         try:
-            conn = sqlite3.connect('shortcuts.db')
-            cursor = conn.cursor()
-            
-            # Get missed shortcut opportunities only from after GUI was opened
-            cursor.execute("""
-                SELECT 
-                    context_action,
-                    COUNT(*) as frequency
-                FROM events 
-                WHERE (context_action LIKE 'SHORTCUT_%' 
-                   OR context_action LIKE '%copy%' 
-                   OR context_action LIKE '%paste%'
-                   OR context_action LIKE '%cut%'
-                   OR context_action LIKE '%save%'
-                   OR context_action LIKE '%new%'
-                   OR context_action LIKE '%open%'
-                   OR context_action LIKE '%undo%'
-                   OR context_action LIKE '%redo%'
-                   OR context_action LIKE '%find%'
-                   OR context_action LIKE '%print%'
-                   OR context_action LIKE '%arrow%'
-                   OR context_action LIKE '%space%'
-                   OR context_action LIKE '%tab%'
-                   OR context_action LIKE '%f5%'
-                   OR context_action LIKE '%alt%')
-                   AND timestamp > ?
-                GROUP BY context_action
-                ORDER BY frequency DESC
-            """, (self.gui_start_time,))
-            
-            opportunities = cursor.fetchall()
-            conn.close()
-            
             # Update table with 2 columns: Shortcut and Counter
-            self.opportunities_table.setRowCount(len(opportunities))
-            for i, opp in enumerate(opportunities):
+            rows = []
+            for opp in opportunities:
                 action = opp[0] or "Unknown"
                 frequency = opp[1]
                 
@@ -421,10 +347,9 @@ class ShortcutCoachGUI(QMainWindow):
                     # We need to reverse-engineer from the database key to the shortcut
                     shortcut = self._get_shortcut_from_database_key(action)
                 
-                # Column 0: Shortcut (e.g., "Ctrl + C")
-                self.opportunities_table.setItem(i, 0, QTableWidgetItem(shortcut))
-                # Column 1: Counter (how many times you didn't use the shortcut)
-                self.opportunities_table.setItem(i, 1, QTableWidgetItem(str(frequency)))
+                # Shortcut (e.g., "Ctrl + C") and counter (how many times you didn't use it)
+                rows.append((shortcut, frequency))
+            self.opportunities_model.set_rows(rows)
                 
         except Exception as e:
             print(f"Error refreshing shortcut opportunities: {e}")
@@ -483,14 +408,11 @@ class ShortcutCoachGUI(QMainWindow):
         """Generate new AI suggestions based on real data using Ollama"""
         try:
             # Show loading message
-            self.suggestions_text.setPlainText("🤖 Analyzing your behavior patterns...\n\nPlease wait while the AI generates personalized suggestions...")
+            self._show_suggestions(SUGGESTIONS_LOADING)
             
             # Get user behavior data from database
-            conn = sqlite3.connect('shortcuts.db')
-            cursor = conn.cursor()
-            
             # Get recent events (last 100 events from after GUI opened)
-            cursor.execute("""
+            events = self._query("""
                 SELECT timestamp, event_type, details, app_name, window_title, context_action
                 FROM events 
                 WHERE timestamp > datetime('now', '-2 hours')
@@ -498,22 +420,8 @@ class ShortcutCoachGUI(QMainWindow):
                 LIMIT 20
             """)
             
-            events = cursor.fetchall()
-            conn.close()
-            
             if len(events) == 0:
-                new_suggestions = """
-🤖 No Data Yet
-
-Start using your computer to collect data for AI-powered insights!
-
-💡 The system will analyze:
-• Your most frequent actions
-• Application switching patterns
-• Missed shortcut opportunities
-• Time-saving workflow suggestions
-                """
-                self.suggestions_text.setPlainText(new_suggestions)
+                self._show_suggestions(SUGGESTIONS_NO_DATA)
                 return
             
             # Convert events to the format expected by Ollama manager
@@ -564,31 +472,36 @@ Start using your computer to collect data for AI-powered insights!
                 total_events = len(behavior_data)
                 unique_apps = len(set(event['app_name'] for event in behavior_data if event['app_name'] != 'Unknown'))
                 
-                new_suggestions = f"""
-🤖 Basic Analysis (AI Unavailable)
-
-Based on your recent activity:
-
-📊 Statistics:
-• Total Events: {total_events}
-• Applications Used: {unique_apps}
-
-💡 The AI analysis is currently unavailable. Try again later!
-                """
+                new_suggestions = SUGGESTIONS_BASIC_TEMPLATE.format(
+                    total_events=total_events, unique_apps=unique_apps
+                )
                 
         except Exception as e:
             print(f"❌ Error generating AI suggestions: {e}")
-            new_suggestions = f"""
-🤖 Analysis Error
-
-Could not generate AI suggestions: {str(e)}
-
-💡 Make sure Ollama is running and try again.
-        """
+            new_suggestions = SUGGESTIONS_ERROR_TEMPLATE.format(error=e)
+        
+        self._show_suggestions(new_suggestions)
         
-        self.suggestions_text.setPlainText(new_suggestions)
+    def _show_suggestions(self, text):
+        """Put text in the suggestions box, skipping the re-layout if it is already shown"""
+        if text != self._last_suggestions:
+            self._last_suggestions = text
+            self.suggestions_text.setPlainText(text)
         
+    def shutdown(self):
+        """Stop the refresh timer and query thread and close both database connections (idempotent)"""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.data_collector.stop()
+        self.refresh_timer.stop()
+        self.query_thread.quit()
+        self.query_thread.wait()
+        self.query_worker.close()
+        with self._db_lock:
+            self._ro_conn.close()
+    
     def closeEvent(self, event):
         """Clean up when closing"""
-        self.data_collector.stop()
+        self.shutdown()
         event.accept()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+GUI Models for Shortcut Coach
+Lightweight Qt table models backing the GUI tables
+"""
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class RowsTableModel(QAbstractTableModel):
+    """Read-only table model backed by a plain list of row tuples.
+    
+    Qt only asks for the cells it paints, so replacing the rows costs a
+    single reset instead of building one item object per cell.
+    """
+    
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """Replace all rows and tell attached views to repaint"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
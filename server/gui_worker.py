@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+GUI Worker for Shortcut Coach
+Runs the GUI's database reads on a background QThread
+"""
+
+import sqlite3
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class QueryWorker(QObject):
+    """Runs read queries off the GUI thread and hands the rows back by signal"""
+    
+    # (query name, rows) - rows is None when the query was skipped or failed
+    results_ready = pyqtSignal(str, object)
+    
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self.conn = None
+        self._last_rowids = {}  # query name -> max(rowid) of events at its last run
+    
+    def _connection(self):
+        """Open the worker's read-only connection on first use"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            self.conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+            self.conn.execute("PRAGMA mmap_size=268435456")
+        return self.conn
+    
+    @pyqtSlot(str, str, object)
+    def run_query(self, name, sql, params):
+        """Run a query unless no events were added since it last ran"""
+        rows = None
+        try:
+            conn = self._connection()
+            max_rowid = conn.execute("SELECT max(rowid) FROM events").fetchone()[0]
+            if max_rowid is None or self._last_rowids.get(name) != max_rowid:
+                rows = conn.execute(sql, params).fetchall()
+                self._last_rowids[name] = max_rowid
+        except Exception as e:
+            print(f"Error running GUI query '{name}': {e}")
+        self.results_ready.emit(name, rows)
+    
+    def close(self):
+        """Close the connection; call once the worker thread has stopped"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
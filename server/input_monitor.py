@@ -1,9 +1,45 @@
+import sys
 import time
 import threading
 import win32clipboard
 import win32con
 from pynput import mouse, keyboard
 from pynput.mouse import Button
+from typing_buffer import TypingBuffer
+from debug_log import logger
+
+# pynput Key names that act as modifiers, mapped to their display names
+MODIFIER_NAMES = {
+    "ctrl": "Ctrl", "ctrl_l": "Ctrl", "ctrl_r": "Ctrl",
+    "shift": "Shift", "shift_l": "Shift", "shift_r": "Shift",
+    "alt": "Alt", "alt_l": "Alt", "alt_r": "Alt", "alt_gr": "Alt",
+    "cmd": "Windows", "cmd_l": "Windows", "cmd_r": "Windows",
+}
+
+# Special keys worth logging on their own (others are skipped to reduce noise)
+LOGGED_SPECIAL_KEYS = frozenset([
+    "tab", "enter", "escape", "backspace", "delete",
+    "page_up", "page_down", "home", "end", "insert"
+])
+
+# Low-level mouse hook messages for button presses/releases (left, right,
+# middle, X buttons); everything else (moves, wheel) is dropped in the hook
+MOUSE_BUTTON_MESSAGES = frozenset([
+    0x0201, 0x0202, 0x0204, 0x0205, 0x0207, 0x0208, 0x020B, 0x020C
+])
+
+# Ctrl+punctuation control chars (27..31) mapped back to their keys
+CTRL_PUNCTUATION = {27: "[", 28: "\\", 29: "]", 30: "^", 31: "_"}
+
+# Punctuation virtual-key codes on a US layout
+VK_PUNCTUATION = {
+    0xBA: ";", 0xBB: "=", 0xBC: ",", 0xBD: "-", 0xBE: ".",
+    0xBF: "/", 0xC0: "`", 0xDB: "[", 0xDC: "\\", 0xDD: "]", 0xDE: "'"
+}
+
+# A held key repeats well within this gap (Windows' default repeat delay is
+# 500ms), so a longer gap means the release was missed and this is a new press
+AUTO_REPEAT_GAP = 0.6
 
 class InputMonitor:
     """Handles mouse and keyboard input monitoring"""
@@ -15,16 +51,24 @@ class InputMonitor:
         self.context_menu_callback = context_menu_callback
         self.mouse_click_callback = mouse_click_callback
         self.running = False
+        self.stop_event = threading.Event()  # set by stop() to wake the clipboard thread
         self.mouse_listener = None
         self.keyboard_listener = None
         self.clipboard_monitor_thread = None
         self.last_clipboard_content = None
         
         # Context menu tracking
-        self.last_right_click_time = None
+        self.last_right_click_time = 0.0  # time.monotonic() of last right-click, 0.0 if none
+        self.context_menu_window = 5.0  # left-clicks within this window count as menu selections
         self.right_click_coords = None
         self.context_menu_active = False
         
+        # (button, pressed) -> handler, so dispatch is a single dict lookup per click
+        self._click_dispatch = {
+            (Button.left, True): self._handle_left_press,
+            (Button.right, True): self._handle_right_press,
+        }
+        
         # Caps Lock tracking
         self.caps_lock_active = False
         
@@ -35,6 +79,16 @@ class InputMonitor:
         
         # Modifier tracking
         self.modifiers = set()  # tracks currently held modifiers: {'Ctrl', 'Shift', 'Alt', 'Windows'}
+        # Special keys currently down -> monotonic time of their last press/repeat,
+        # to spot auto-repeat presses
+        self.held_keys = {}
+        
+        # Special-key names resolved once, so the hot path never builds str(key)
+        self._key_names = {k: sys.intern(k.name) for k in keyboard.Key}
+        
+        # Plain characters are coalesced into one "Key Sequence" event, flushed
+        # after a short idle period or before any other input event
+        self.typing_buffer = TypingBuffer(self._log_key_sequence)
     
     def start_clipboard_monitoring(self):
         """Start monitoring clipboard changes in background thread"""
@@ -63,11 +117,11 @@ class InputMonitor:
                 except Exception as e:
                     pass  # Clipboard might be locked by other applications
                 
-                # Use shorter sleep time and check running status more frequently
-                for _ in range(10):  # Check 10 times per second
-                    if not self.running:
+                # Tick 10 times per second for idle typing flushes; stop() wakes the wait at once
+                for _ in range(10):
+                    if self.stop_event.wait(0.1):
                         break
-                    time.sleep(0.1)
+                    self.typing_buffer.flush_idle()
                     
                 # Also check Caps Lock state and language periodically
                 self.refresh_caps_lock_state()
@@ -90,7 +144,7 @@ class InputMonitor:
         """Safe wrapper for keyboard callback to prevent crashes"""
         try:
             if is_press:
-                print(f"🔤 Keyboard event: {key}")  # Debug output
+                logger.debug("🔤 Keyboard event: %s", key)
                 self.on_key_press(key)
             else:
                 self.on_key_release(key)
@@ -99,6 +153,10 @@ class InputMonitor:
     
     def on_click(self, x, y, button, pressed):
         """Handle mouse click events with context menu detection"""
+        # A click usually moves focus, so close off any typing burst first
+        if pressed:
+            self.typing_buffer.flush()
+        
         # Call custom mouse callback if provided
         if self.mouse_click_callback:
             try:
@@ -106,58 +164,71 @@ class InputMonitor:
             except Exception as e:
                 print(f"Error in custom mouse callback: {e}")
         
-        if pressed:
-            if button == Button.left:
-                # Check if this left-click might be a context menu selection
-                if self.last_right_click_time and (time.time() - self.last_right_click_time) < 5.0:
-                    # Left-click within 5 seconds of right-click - likely context menu selection
-                    self.event_callback("Left Click (Context Menu)", "Context Menu Selection", context_action="MENU_SELECTION")
-                    # Call context menu callback for analysis
-                    if self.context_menu_callback:
-                        self.context_menu_callback(x, y, button, pressed)
-                    self.context_menu_active = False
-                else:
-                    # Don't log basic left clicks to database - let the UI analysis handle it
-                    # self.event_callback("Left Click", "Left Click")  # Commented out to prevent "Unknown" app logging
-                    # Call context menu callback for UI element detection on ALL left clicks
-                    if self.context_menu_callback:
-                        self.context_menu_callback(x, y, button, pressed)
-                    
-            elif button == Button.right:
-                # Don't log basic right clicks to database - let the UI analysis handle it
-                # self.event_callback("Right Click", "Right Click", context_action="CONTEXT_MENU_OPENED")  # Commented out to prevent "Unknown" app logging
-                self.last_right_click_time = time.time()
-                self.right_click_coords = (x, y)
-                self.context_menu_active = True
-                # Call context menu callback for analysis
-                if self.context_menu_callback:
-                    self.context_menu_callback(x, y, button, pressed)
+        handler = self._click_dispatch.get((button, pressed))
+        if handler:
+            handler(x, y, button, pressed)
+    
+    def _handle_left_press(self, x, y, button, pressed):
+        """Handle a left-button press, detecting context menu selections"""
+        # Check if this left-click might be a context menu selection
+        right_click_time = self.last_right_click_time
+        if right_click_time and time.monotonic() - right_click_time < self.context_menu_window:
+            # Left-click within 5 seconds of right-click - likely context menu selection
+            self.event_callback("Left Click (Context Menu)", "Context Menu Selection",
+                                x=x, y=y, context_action="MENU_SELECTION")
+            # Call context menu callback for analysis
+            if self.context_menu_callback:
+                self.context_menu_callback(x, y, button, pressed)
+            self.context_menu_active = False
+        else:
+            # Don't log basic left clicks to database - let the UI analysis handle it
+            # self.event_callback("Left Click", "Left Click")  # Commented out to prevent "Unknown" app logging
+            # Call context menu callback for UI element detection on ALL left clicks
+            if self.context_menu_callback:
+                self.context_menu_callback(x, y, button, pressed)
+    
+    def _handle_right_press(self, x, y, button, pressed):
+        """Handle a right-button press, which may open a context menu"""
+        # Don't log basic right clicks to database - let the UI analysis handle it
+        # self.event_callback("Right Click", "Right Click", context_action="CONTEXT_MENU_OPENED")  # Commented out to prevent "Unknown" app logging
+        self.last_right_click_time = time.monotonic()
+        self.right_click_coords = (x, y)
+        self.context_menu_active = True
+        # Call context menu callback for analysis
+        if self.context_menu_callback:
+            self.context_menu_callback(x, y, button, pressed)
     
     def on_key_press(self, key):
         """Handle keyboard key press events - log meaningful keys and shortcuts"""
         try:
-            key_str = str(key).lower()
+            # Printable keys carry a char; special keys resolve via the lookup table
+            char = getattr(key, "char", None)
+            special_name = self._key_names.get(key) if char is None else None
+            
+            # Ignore OS auto-repeat of held special keys and modifiers (typed
+            # characters still repeat, since they only extend the typing buffer)
+            if char is None:
+                now = time.monotonic()
+                last_press = self.held_keys.get(key)
+                self.held_keys[key] = now
+                # A release can be missed (secure desktop, elevated windows), so a
+                # key is only treated as held while its repeats keep arriving
+                if last_press is not None and now - last_press < AUTO_REPEAT_GAP:
+                    return
+            
+            # Anything other than plain typing ends the current typing burst
+            if char is None or self.modifiers:
+                self.typing_buffer.flush()
 
             # Track modifiers
-            if any(m in key_str for m in ["key.ctrl", "key.ctrl_l", "key.ctrl_r"]):
-                self.modifiers.add("Ctrl")
-                self.event_callback("Key Press", "Ctrl", context_action="SPECIAL_KEY")
-                return
-            if any(m in key_str for m in ["key.shift", "key.shift_l", "key.shift_r"]):
-                self.modifiers.add("Shift")
-                self.event_callback("Key Press", "Shift", context_action="SPECIAL_KEY")
-                return
-            if any(m in key_str for m in ["key.alt", "key.alt_l", "key.alt_r"]):
-                self.modifiers.add("Alt")
-                self.event_callback("Key Press", "Alt", context_action="SPECIAL_KEY")
-                return
-            if "key.cmd" in key_str or "key.win" in key_str:
-                self.modifiers.add("Windows")
-                self.event_callback("Key Press", "Windows", context_action="SPECIAL_KEY")
+            modifier = MODIFIER_NAMES.get(special_name)
+            if modifier:
+                self.modifiers.add(modifier)
+                self.event_callback("Key Press", modifier, context_action="SPECIAL_KEY")
                 return
 
             # Non-modifier key
-            key_name = self._key_display_name(key)
+            key_name = self._key_display_name(key, char)
             
             # Safety check: prevent empty key names from slipping through
             if not key_name or key_name.strip() == "":
@@ -173,15 +244,17 @@ class InputMonitor:
                 self.event_callback("Shortcut", combo, context_action="COMBO")
             else:
                 # Handle regular character keys
-                if hasattr(key, 'char') and key.char:
-                    char = key.char
+                if char:
+                    lower_char = char.lower()
+                    if lower_char in ('c', 'v', 'x') and self.context_menu_active:
+                        self.typing_buffer.flush()
                     
                     # Check for context menu shortcuts
-                    if char.lower() == 'c' and self.context_menu_active:
+                    if lower_char == 'c' and self.context_menu_active:
                         self.event_callback("Key Press", "C", context_action="COPY_SHORTCUT")
-                    elif char.lower() == 'v' and self.context_menu_active:
+                    elif lower_char == 'v' and self.context_menu_active:
                         self.event_callback("Key Press", "V", context_action="PASTE_SHORTCUT")
-                    elif char.lower() == 'x' and self.context_menu_active:
+                    elif lower_char == 'x' and self.context_menu_active:
                         self.event_callback("Key Press", "X", context_action="CUT_SHORTCUT")
                     # Log regular characters with proper case handling
                     else:
@@ -203,39 +276,37 @@ class InputMonitor:
                             context = "TYPING_CAPS"
                         
                         # Debug output to show character, state, and language
-                        print(f"🔤 Typing: '{char}' → '{display_char}' (Caps: {'ON' if self.caps_lock_active else 'OFF'}, Lang: {self.current_language})")
+                        logger.debug("🔤 Typing: '%s' → '%s' (Caps: %s, Lang: %s)", char, display_char,
+                                     "ON" if self.caps_lock_active else "OFF", self.current_language)
                         
-                        # Log the properly formatted character with language context
-                        self.event_callback("Key Press", display_char, context_action=context)
+                        # Buffer the properly formatted character; the burst is logged as one event
+                        self.typing_buffer.add(display_char, context)
                 else:
                     # Handle special keys (Ctrl, Alt, Shift, etc.)
-                    formatted_key = self.format_key_name(str(key))
-                    
                     # Handle Caps Lock specifically
-                    if 'caps_lock' in key_str:
+                    if special_name == 'caps_lock':
                         self.caps_lock_active = not self.caps_lock_active  # Toggle state
                         status = "ON" if self.caps_lock_active else "OFF"
                         self.event_callback("Key Press", f"Caps Lock {status}", context_action="CAPS_LOCK_TOGGLE")
                     # Log other important special keys
-                    elif any(special in key_str for special in ['tab','enter','escape','backspace','delete','page_up','page_down','home','end','insert']):
-                        self.event_callback("Key Press", formatted_key, context_action="SPECIAL_KEY")
+                    elif special_name in LOGGED_SPECIAL_KEYS:
+                        self.event_callback("Key Press", self.format_key_name(special_name), context_action="SPECIAL_KEY")
                     # Skip other special keys to reduce noise
 
         except Exception as e:
             print(f"Keyboard callback error: {e}")
     
+    def _log_key_sequence(self, text, context):
+        """Log a finished typing burst as a single "Key Sequence" event"""
+        self.event_callback("Key Sequence", text, context_action=context)
+    
     def on_key_release(self, key):
         """Handle keyboard key release events - clear modifiers when released"""
         try:
-            k = str(key).lower()
-            if any(m in k for m in ["key.ctrl", "key.ctrl_l", "key.ctrl_r"]):
-                self.modifiers.discard("Ctrl")
-            elif any(m in k for m in ["key.shift", "key.shift_l", "key.shift_r"]):
-                self.modifiers.discard("Shift")
-            elif any(m in k for m in ["key.alt", "key.alt_l", "key.alt_r"]):
-                self.modifiers.discard("Alt")
-            elif "key.cmd" in k or "key.win" in k:
-                self.modifiers.discard("Windows")
+            self.held_keys.pop(key, None)
+            modifier = MODIFIER_NAMES.get(self._key_names.get(key))
+            if modifier:
+                self.modifiers.discard(modifier)
         except Exception:
             pass
         
@@ -296,20 +367,21 @@ class InputMonitor:
         # Return formatted key name or capitalize the original
         return key_mapping.get(key_name.lower(), key_name.title())
     
-    def _key_display_name(self, key):
-        """Resolve a printable key name even when char is None or is a control char."""
+    def _key_display_name(self, key, ch):
+        """Resolve a printable key name even when char is None or is a control char.
+
+        ch is the key's char as already read by on_key_press (None for special keys).
+        """
         # If pynput gave us a character
-        if hasattr(key, "char") and key.char:
-            ch = key.char
+        if ch:
             # Map ASCII control chars (ETX, etc.) back to letters when possible
             # Ctrl+A..Ctrl+Z -> 0x01..0x1A
             code = ord(ch)
             if 1 <= code <= 26:
                 return chr(code + 64)  # 1->A, 2->B, ..., 26->Z
             # Some Ctrl+punctuation combos map to 27..31
-            ctrl_punct = {27: "[", 28: "\\", 29: "]", 30: "^", 31: "_"}
-            if code in ctrl_punct:
-                return ctrl_punct[code]
+            if code in CTRL_PUNCTUATION:
+                return CTRL_PUNCTUATION[code]
             # Normal printable char
             return ch.upper() if ch.isalpha() else ch
 
@@ -323,22 +395,22 @@ class InputMonitor:
             if 0x30 <= vk <= 0x39:
                 return chr(vk)
             # Common punctuation on US layout fallback
-            vk_map = {
-                0xBA: ";", 0xBB: "=", 0xBC: ",", 0xBD: "-", 0xBE: ".",
-                0xBF: "/", 0xC0: "`", 0xDB: "[", 0xDC: "\\", 0xDD: "]", 0xDE: "'"
-            }
-            if vk in vk_map:
-                return vk_map[vk]
+            if vk in VK_PUNCTUATION:
+                return VK_PUNCTUATION[vk]
 
         # Fallback to formatted special name (e.g., Enter, Tab)
-        return self.format_key_name(str(key))
+        return self.format_key_name(self._key_names.get(key) or str(key))
     
     def start_listeners(self):
         """Start input listeners with error handling"""
         try:
             print("🎯 Starting mouse listener...")
+            # Only clicks are used, so moves and wheel events are filtered out
+            # before pynput decodes and dispatches them (a high polling rate
+            # mouse sends hundreds of moves per second)
             self.mouse_listener = mouse.Listener(
-                on_click=self.safe_mouse_callback
+                on_click=self.safe_mouse_callback,
+                win32_event_filter=self._mouse_event_filter
             )
             
             print("🎯 Starting keyboard listener...")
@@ -361,6 +433,11 @@ class InputMonitor:
             print("Continuing with window tracking only...")
             return False
     
+    @staticmethod
+    def _mouse_event_filter(msg, data):
+        """Let only button messages through the mouse hook"""
+        return msg in MOUSE_BUTTON_MESSAGES
+    
     def stop_listeners(self):
         """Stop all input listeners"""
         if self.mouse_listener:
@@ -384,6 +461,7 @@ class InputMonitor:
     def start(self):
         """Start input monitoring"""
         self.running = True
+        self.stop_event.clear()
         
         # Check initial Caps Lock state and language
         self.check_caps_lock_state()
@@ -420,7 +498,7 @@ class InputMonitor:
             
             if new_state != self.caps_lock_active:
                 self.caps_lock_active = new_state
-                print(f"🔤 Caps Lock state changed to: {'ON' if self.caps_lock_active else 'OFF'}")
+                logger.debug("🔤 Caps Lock state changed to: %s", 'ON' if self.caps_lock_active else 'OFF')
                 
         except Exception as e:
             pass  # Silently fail if we can't check
@@ -463,15 +541,15 @@ class InputMonitor:
                 if self.current_language is not None and self.current_language != "Unknown" and language_name != self.current_language:
                     old_language = self.current_language
                     self.current_language = language_name
-                    print(f"🌍 Language changed from {old_language} to {language_name}")
+                    logger.debug("🌍 Language changed from %s to %s", old_language, language_name)
                     
                     # Log language change event
-                    if hasattr(self, 'event_callback'):
+                    if self.event_callback is not None:
                         self.event_callback("Language Change", f"Switched to {language_name}", context_action="LANGUAGE_SWITCH")
                 else:
                     # Just set the current language without reporting a change
                     if self.current_language is None:
-                        print(f"🔍 Initial language detected: {language_name} (not logged)")
+                        logger.debug("🔍 Initial language detected: %s (not logged)", language_name)
                     self.current_language = language_name
                     # Don't log initial language detection to database
                     
@@ -484,4 +562,6 @@ class InputMonitor:
     def stop(self):
         """Stop input monitoring"""
         self.running = False
+        self.stop_event.set()
         self.stop_listeners()
+        self.typing_buffer.flush()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+JSON Scanner for Shortcut Coach
+Locates the first JSON object in free-form LLM output, including while it streams in
+"""
+
+
+class FirstJsonScanner:
+    """Finds the first complete top-level {...} object in text fed in pieces
+
+    Braces inside JSON strings (including escaped quotes) are ignored.
+    """
+    
+    __slots__ = ("pos", "start", "end", "depth", "in_string", "escaped")
+    
+    def __init__(self):
+        self.pos = 0  # offset of the next character to scan
+        self.start = -1
+        self.end = -1  # one past the closing brace once found
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Scan the next piece of text; returns True once the first object is closed"""
+        if self.end >= 0:
+            return True
+        for ch in text:
+            self.pos += 1
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.depth:
+                    self.in_string = True
+            elif ch == '{':
+                if self.depth == 0:
+                    self.start = self.pos - 1
+                self.depth += 1
+            elif ch == '}' and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self.pos
+                    return True
+        return False
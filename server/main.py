@@ -9,6 +9,11 @@ from core_system import ShortcutCoach
 
 def main():
     """Main entry point for Shortcut Coach"""
+    if sys.platform == "win32" and sys.stdout is not None:
+        # Emoji through the legacy console code page is slow; write UTF-8
+        # and let the console batch writes instead of flushing every line
+        sys.stdout.reconfigure(encoding="utf-8", line_buffering=False)
+
     try:
         print("🎯 Starting Shortcut Coach...")
         print("=" * 50)
@@ -1,27 +1,41 @@
-import sys
 import time
-import random
+from collections import OrderedDict
+import numpy as np
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QVBoxLayout,
-    QGraphicsOpacityEffect, QGraphicsBlurEffect,
-    QGraphicsScene, QGraphicsPixmapItem
+    QApplication, QWidget
 )
 from PyQt6.QtCore import (
-    Qt, QTimer, QPropertyAnimation, QEasingCurve, QObject,
-    pyqtSignal, QRectF
+    Qt, QTimer, QPropertyAnimation, QEasingCurve
 )
 from PyQt6.QtGui import (
     QPainter, QPainterPath, QColor, QPen, QBrush, QPixmap, QImage,
-    QLinearGradient, QRadialGradient, QTransform, QFont, QFontMetrics
+    QLinearGradient, QRadialGradient, QFont, QFontMetrics
 )
-
-
-def clamp_byte(v):
-    return 0 if v < 0 else 255 if v > 255 else int(v)
+from glass_pixels import pixel_view, box4_average, bc_kernel
 
 
 class LiquidGlassNotification(QWidget):
-    """Liquid glass notification with anchor+offset positioning"""
+    """Liquid glass notification with anchor+offset positioning
+
+    Hidden (not destroyed) after fading out so the same window can be reused
+    for the next message via set_message().
+    """
+
+    # Fixed paint resources, shared by every instance and paint
+    _GLASS_BRUSH = QBrush(QColor(255, 255, 255, 60))
+    # Ambient and halo "shadows" both cover the whole widget (it cannot paint
+    # outside itself), so they are one fill with the two alphas combined
+    _AMBIENT_BRUSH = QBrush(QColor(0, 0, 0, 27))
+    _CONTACT_BRUSH = QBrush(QColor(0, 0, 0, 22))
+    _SIDE_BRUSH = QBrush(QColor(255, 255, 255, 26))
+    _RIM_PEN = QPen(QColor(255, 255, 255, 38), 1)
+    _TEXT_PEN = QPen(QColor(0x12, 0x12, 0x12))
+    _TOP_GRAD_STOPS = ((0.0, QColor(255, 255, 255, 56)), (1.0, QColor(255, 255, 255, 0)))
+    _HOTSPOT_STOPS = (
+        (0.0, QColor(255, 255, 255, 70)),
+        (0.35, QColor(255, 255, 255, 24)),
+        (1.0, QColor(255, 255, 255, 0)),
+    )
 
     def __init__(self, message, shortcut, duration=3.0,
                  corner="bottom-right", offset=(30, 60)):  # lower by default
@@ -59,6 +73,19 @@ class LiquidGlassNotification(QWidget):
         self._need_backdrop_refresh = True
         self._avg_bg_color = QColor(255, 255, 255)
         self._noise_tile = self._make_noise_tile(64)
+        # Converted to a pixmap brush once rather than on every decor rebuild
+        self._noise_brush = QBrush(QPixmap.fromImage(self._noise_tile))
+
+        # Pre-rendered glass layers; rebuilt by paintEvent when the key changes
+        self._decor_pixmap = None
+        self._capsule_path = None
+        self._decor_key = None
+
+        # Recent backdrops by window geometry: (x, y, w, h) -> (monotonic expiry,
+        # image, average color). Short-lived since the screen behind keeps changing
+        self._backdrop_cache = OrderedDict()
+        self._backdrop_cache_ttl = 1.0
+        self._backdrop_cache_max = 8
 
         # Throttled updater for backdrop capture on move/resize
         self._backdrop_timer = QTimer(self)
@@ -66,66 +93,51 @@ class LiquidGlassNotification(QWidget):
         self._backdrop_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self._backdrop_timer.timeout.connect(self._update_backdrop_now)
 
-        # Opacity effect and animation
-        self._opacity_effect = QGraphicsOpacityEffect(self)
-        self._opacity_effect.setOpacity(1.0)
-        self.setGraphicsEffect(self._opacity_effect)
-
-        self.fade_animation = QPropertyAnimation(self._opacity_effect, b"opacity", self)
+        # Fade animation on the window opacity itself, which the window manager
+        # composites; no offscreen re-render of the widget per frame
+        self.fade_animation = QPropertyAnimation(self, b"windowOpacity", self)
         self.fade_animation.setDuration(220)
         self.fade_animation.setStartValue(1.0)
         self.fade_animation.setEndValue(0.0)
         self.fade_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        self.fade_animation.finished.connect(self.close)
+        self.fade_animation.finished.connect(self.hide)
 
-        # Timers
+        # Timers (coarse: a few ms either way is invisible on a 3s display and
+        # lets Qt batch these wakeups with other work)
         self.hide_timer = QTimer(self)
         self.hide_timer.setSingleShot(True)
-        self.hide_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.hide_timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.hide_timer.timeout.connect(self.start_fade_out)
 
         self.force_close_timer = QTimer(self)
         self.force_close_timer.setSingleShot(True)
-        self.force_close_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.force_close_timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.force_close_timer.timeout.connect(self.force_close)
 
     # ---------- sizing and UI ----------
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(self.pad_x, self.pad_y, self.pad_x, self.pad_y)
-
-        self.message_label = QLabel(self.message)
-        self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.message_label.setWordWrap(False)
-        self.message_label.setStyleSheet("""
-            QLabel {
-                color: #121212;
-                font-family: 'Segoe UI';
-                font-size: 16px;
-                font-weight: 500;
-                background: transparent;
-                border: none;
-                padding: 0px;
-                letter-spacing: 0.1px;
-                margin: 0px;
-            }
-        """)
-        layout.addWidget(self.message_label)
+        # The message is painted directly in paintEvent; no layout or child label
+        self._text_font = QFont("Segoe UI")
+        self._text_font.setPixelSize(16)
+        self._text_font.setWeight(QFont.Weight.Medium)
+        self._text_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 0.1)
+        self._text_metrics = QFontMetrics(self._text_font)
+        self._display_text = self.message
 
     def _resize_to_text(self):
-        fm = QFontMetrics(self.message_label.font())
-        text = self.message_label.text()
+        fm = self._text_metrics
+        text = self.message
 
         max_text_w = self.max_width - self.pad_x * 2
         full_w = fm.horizontalAdvance(text)
 
         if full_w > max_text_w:
             text = fm.elidedText(text, Qt.TextElideMode.ElideRight, max_text_w)
-            self.message_label.setText(text)
             text_w = fm.horizontalAdvance(text)
         else:
             text_w = full_w
+        self._display_text = text
 
         text_h = fm.height()
         w = text_w + self.pad_x * 2
@@ -169,12 +181,38 @@ class LiquidGlassNotification(QWidget):
 
     def showEvent(self, event):
         QTimer.singleShot(0, self._update_backdrop_now)
+        self._start_timers()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        # The next show may be over a different screen, so start from fresh grabs
+        self._backdrop_cache.clear()
+        super().hideEvent(event)
+
+    def _start_timers(self):
         self.hide_timer.start(int(self.duration * 1000))
         self.force_close_timer.start(int(self.duration * 1000) + 1000)
-        super().showEvent(event)
+
+    def set_message(self, message, shortcut, duration=3.0):
+        """Show a new message in this window, restarting its display time."""
+        self.message = message
+        self.shortcut = shortcut
+        self.duration = float(duration)
+
+        self.fade_animation.stop()
+        self.setWindowOpacity(1.0)
+        self._resize_to_text()
+        self._move_to_anchor()
+
+        # A hidden window gets its backdrop and timers from showEvent
+        if self.isVisible():
+            self._schedule_backdrop_update()
+            self._start_timers()
+            self.update()
 
     def moveEvent(self, event):
-        self._schedule_backdrop_update()
+        # Wait until the window has stopped moving rather than regrabbing per frame
+        self._schedule_backdrop_update(delay_ms=150)
         super().moveEvent(event)
 
     def resizeEvent(self, event):
@@ -185,21 +223,23 @@ class LiquidGlassNotification(QWidget):
     # ---------- timers and closing ----------
 
     def start_fade_out(self):
-        if self._opacity_effect.opacity() <= 0.01:
-            self.close()
+        self._backdrop_timer.stop()
+        if self.windowOpacity() <= 0.01:
+            self.hide()
             return
         self.fade_animation.start()
 
     def force_close(self):
         if self.isVisible():
+            self.fade_animation.stop()
             self.hide()
-            self.close()
 
     # ---------- backdrop blur & helpers ----------
 
-    def _schedule_backdrop_update(self):
+    def _schedule_backdrop_update(self, delay_ms=16):
+        # Restarting the single-shot timer debounces: only the last call fires
         self._need_backdrop_refresh = True
-        self._backdrop_timer.start(16)
+        self._backdrop_timer.start(delay_ms)
 
     def _update_backdrop_now(self):
         try:
@@ -209,31 +249,32 @@ class LiquidGlassNotification(QWidget):
             if not screen or w <= 0 or h <= 0:
                 return
 
+            key = (x, y, w, h)
+            now = time.monotonic()
+            cached = self._backdrop_cache.get(key)
+            if cached and cached[0] > now:
+                _, self._backdrop_img, self._avg_bg_color = cached
+                self._backdrop_cache.move_to_end(key)
+                self._need_backdrop_refresh = False
+                self.update()
+                return
+
             shot = screen.grabWindow(0, x, y, w, h)
             if shot.isNull():
                 return
 
-            dpr = shot.devicePixelRatio()
-            size_px = shot.size()
-
-            scene = QGraphicsScene()
-            item = QGraphicsPixmapItem(shot)
-            blur = QGraphicsBlurEffect()
-            blur.setBlurRadius(28.0)
-            item.setGraphicsEffect(blur)
-            scene.addItem(item)
-            scene.setSceneRect(QRectF(0, 0, size_px.width(), size_px.height()))
-
-            img = QImage(size_px, QImage.Format.Format_ARGB32_Premultiplied)
-            img.setDevicePixelRatio(dpr)
-            img.fill(0)
-            p = QPainter(img)
-            scene.render(p, target=QRectF(0, 0, size_px.width(), size_px.height()))
-            p.end()
+            img = self._kawase_blur(shot.toImage())
+            img.setDevicePixelRatio(shot.devicePixelRatio())
 
             self._backdrop_img = self._adjust_brightness_contrast(img, brightness=0.05, contrast=0.05)
             self._avg_bg_color = self._compute_average_color(self._backdrop_img)
 
+            self._backdrop_cache[key] = (now + self._backdrop_cache_ttl,
+                                         self._backdrop_img, self._avg_bg_color)
+            self._backdrop_cache.move_to_end(key)
+            if len(self._backdrop_cache) > self._backdrop_cache_max:
+                self._backdrop_cache.popitem(last=False)
+
             self._need_backdrop_refresh = False
             self.update()
         except Exception:
@@ -241,137 +282,161 @@ class LiquidGlassNotification(QWidget):
             self._need_backdrop_refresh = False
             self.update()
 
+    def _kawase_blur(self, img: QImage, passes=3) -> QImage:
+        """Dual-pass (Kawase-style) blur: halve and 4-tap average each pass, then scale back up
+
+        passes=3 shrinks 8x, close to the old radius-28 QGraphicsBlurEffect.
+        """
+        w, h = img.width(), img.height()
+        small = img.convertToFormat(QImage.Format.Format_RGB32)
+        for _ in range(passes):
+            small = small.scaled(max(1, small.width() // 2), max(1, small.height() // 2),
+                                 Qt.AspectRatioMode.IgnoreAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+            pixels = pixel_view(small, writable=True)
+            pixels[...] = box4_average(pixels)
+        blurred = small.scaled(w, h,
+                               Qt.AspectRatioMode.IgnoreAspectRatio,
+                               Qt.TransformationMode.SmoothTransformation)
+        return blurred.convertToFormat(QImage.Format.Format_RGB32)
+
     def _adjust_brightness_contrast(self, img: QImage, brightness=0.0, contrast=0.0) -> QImage:
         if img is None:
             return None
-        out = QImage(img.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        out = QImage(img.size(), QImage.Format.Format_RGB32)
         out.setDevicePixelRatio(img.devicePixelRatio())
-        w, h = img.width(), img.height()
 
         b = int(255 * brightness)
         c = contrast
         c_factor = (259 * (c * 255 + 255)) / (255 * (259 - c * 255)) if c != 0 else 1.0
 
-        for y in range(h):
-            src = img.scanLine(y)
-            dst = out.scanLine(y)
-            src_mv = memoryview(src)
-            dst_mv = memoryview(dst)
-            for x in range(0, w * 4, 4):
-                b0 = src_mv[x + 0]
-                g0 = src_mv[x + 1]
-                r0 = src_mv[x + 2]
-                a0 = src_mv[x + 3]
-
-                r = clamp_byte((c_factor * (r0 - 128) + 128) + b)
-                g = clamp_byte((c_factor * (g0 - 128) + 128) + b)
-                bch = clamp_byte((c_factor * (b0 - 128) + 128) + b)
-
-                dst_mv[x + 0] = bch
-                dst_mv[x + 1] = g
-                dst_mv[x + 2] = r
-                dst_mv[x + 3] = a0
+        # The formula depends only on the channel value, so evaluate it once per
+        # byte value and look every channel up in the table
+        v = np.arange(256, dtype=np.float32)
+        lut = np.clip((v - 128.0) * c_factor + 128.0 + b, 0, 255).astype(np.uint8)
+
+        src = pixel_view(img)
+        dst = pixel_view(out, writable=True)
+        if bc_kernel is not None:
+            bc_kernel(src, dst, lut)
+        else:
+            dst[..., :3] = lut[src[..., :3]]
+            dst[..., 3] = src[..., 3]
         return out
 
     def _compute_average_color(self, img: QImage) -> QColor:
-        if img is None:
+        if img is None or img.width() <= 0 or img.height() <= 0:
             return QColor(255, 255, 255)
         w, h = img.width(), img.height()
         step_x = max(1, w // 24)
         step_y = max(1, h // 12)
-        rs = gs = bs = count = 0
-        for y in range(0, h, step_y):
-            line = memoryview(img.scanLine(y))
-            for x in range(0, w, step_x):
-                i = x * 4
-                b0 = line[i + 0]
-                g0 = line[i + 1]
-                r0 = line[i + 2]
-                rs += r0
-                gs += g0
-                bs += b0
-                count += 1
-        if count == 0:
-            return QColor(255, 255, 255)
-        return QColor(int(rs / count), int(gs / count), int(bs / count))
+        # Pixels are BGRA in memory
+        bgr = pixel_view(img)[::step_y, ::step_x, :3].reshape(-1, 3).mean(axis=0)
+        return QColor(int(bgr[2]), int(bgr[1]), int(bgr[0]))
 
     def _make_noise_tile(self, size: int) -> QImage:
         img = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
-        img.fill(0)
-        rng = random.Random(1337)
-        for y in range(size):
-            for x in range(size):
-                v = rng.randint(118, 138)
-                img.setPixel(x, y, QColor(v, v, v, 18).rgba())
+        v = np.random.default_rng(1337).integers(118, 139, size=(size, size), dtype=np.uint16)
+        # Grey at alpha 18, stored premultiplied as setPixel(QColor(v, v, v, 18)) would
+        pixels = pixel_view(img, writable=True)
+        pixels[..., :3] = ((v * 18 + 127) // 255)[..., None]
+        pixels[..., 3] = 18
         return img
 
     # ---------- painting ----------
 
-    def paintEvent(self, event):
-        if self._need_backdrop_refresh and not self._backdrop_timer.isActive():
-            self._update_backdrop_now()
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def _rebuild_decor(self):
+        """Bake every layer above the backdrop, except the text, into one pixmap
 
+        They depend only on the widget size and the backdrop's average color,
+        so paintEvent reuses the result until one of those changes.
+        """
         rect_w = self.width()
         rect_h = self.height()
         radius = rect_h // 2
+        dpr = self.devicePixelRatioF()
 
         capsule = QPainterPath()
         capsule.addRoundedRect(0, 0, rect_w, rect_h, radius, radius)
+        self._capsule_path = capsule
+
+        decor = QPixmap(round(rect_w * dpr), round(rect_h * dpr))
+        decor.setDevicePixelRatio(dpr)
+        decor.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(decor)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         painter.save()
         painter.setClipPath(capsule)
 
-        if self._backdrop_img is not None:
-            painter.drawImage(0, 0, self._backdrop_img)
-
         tint = QColor(self._avg_bg_color)
         tint.setRed(int((tint.red() + 255) / 2))
         tint.setGreen(int((tint.green() + 255) / 2))
         tint.setBlue(int((tint.blue() + 255) / 2))
         painter.fillPath(capsule, QBrush(QColor(tint.red(), tint.green(), tint.blue(), 36)))
-        painter.fillPath(capsule, QBrush(QColor(255, 255, 255, 60)))
+        painter.fillPath(capsule, self._GLASS_BRUSH)
 
-        if self._noise_tile is not None:
-            brush = QBrush(QPixmap.fromImage(self._noise_tile))
-            brush.setTransform(QTransform())
-            painter.fillPath(capsule, brush)
+        painter.fillPath(capsule, self._noise_brush)
 
         painter.restore()
 
         ambient = QPainterPath()
         ambient.addRoundedRect(-3, -3, rect_w + 6, rect_h + 6, radius + 3, radius + 3)
-        painter.fillPath(ambient, QBrush(QColor(0, 0, 0, 16)))
+        painter.fillPath(ambient, self._AMBIENT_BRUSH)
 
         contact = QPainterPath()
         contact.addRoundedRect(6, rect_h - 5, rect_w - 12, 3, 2, 2)
-        painter.fillPath(contact, QBrush(QColor(0, 0, 0, 22)))
+        painter.fillPath(contact, self._CONTACT_BRUSH)
 
         top_grad = QLinearGradient(0, 0, 0, rect_h * 0.55)
-        top_grad.setColorAt(0.0, QColor(255, 255, 255, 56))
-        top_grad.setColorAt(1.0, QColor(255, 255, 255, 0))
+        top_grad.setStops(self._TOP_GRAD_STOPS)
         top_rect = QPainterPath()
         top_rect.addRoundedRect(2, 2, rect_w - 4, rect_h * 0.55, radius - 2, radius - 2)
         painter.fillPath(top_rect, QBrush(top_grad))
 
         hotspot = QRadialGradient(rect_w * 0.28, rect_h * 0.28, rect_h * 0.6)
-        hotspot.setColorAt(0.0, QColor(255, 255, 255, 70))
-        hotspot.setColorAt(0.35, QColor(255, 255, 255, 24))
-        hotspot.setColorAt(1.0, QColor(255, 255, 255, 0))
+        hotspot.setStops(self._HOTSPOT_STOPS)
         painter.fillPath(capsule, QBrush(hotspot))
 
         side = QPainterPath()
         side.addRoundedRect(3, 3, 3, rect_h - 6, 1, 1)
-        painter.fillPath(side, QBrush(QColor(255, 255, 255, 26)))
+        painter.fillPath(side, self._SIDE_BRUSH)
 
-        painter.setPen(QPen(QColor(255, 255, 255, 38), 1))
+        painter.setPen(self._RIM_PEN)
         painter.drawPath(capsule)
+        painter.end()
+
+        self._decor_pixmap = decor
+        self._decor_key = (rect_w, rect_h, dpr, self._avg_bg_color.rgb())
 
-        halo = QPainterPath()
-        halo.addRoundedRect(-1, -1, rect_w + 2, rect_h + 2, radius + 1, radius + 1)
-        painter.fillPath(halo, QBrush(QColor(0, 0, 0, 12)))
+    def paintEvent(self, event):
+        # A fresh grab is not worth it while fading out; the old one is barely visible
+        if (self._need_backdrop_refresh and not self._backdrop_timer.isActive()
+                and self.windowOpacity() > 0.2):
+            self._update_backdrop_now()
+
+        if self._decor_key != (self.width(), self.height(), self.devicePixelRatioF(),
+                               self._avg_bg_color.rgb()):
+            self._rebuild_decor()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if self._backdrop_img is not None:
+            painter.save()
+            painter.setClipPath(self._capsule_path)
+            painter.drawImage(0, 0, self._backdrop_img)
+            painter.restore()
+
+        painter.drawPixmap(0, 0, self._decor_pixmap)
+
+        painter.setFont(self._text_font)
+        painter.setPen(self._TEXT_PEN)
+        painter.drawText(
+            self.rect().adjusted(self.pad_x, self.pad_y, -self.pad_x, -self.pad_y),
+            Qt.AlignmentFlag.AlignCenter, self._display_text
+        )
 
     # ---------- external API ----------
 
@@ -388,62 +453,3 @@ class LiquidGlassNotification(QWidget):
             pass
         self.deleteLater()
         event.accept()
-
-
-class PyQt6NotificationSystem(QObject):
-    """Thread-safe notification system with global position control."""
-    show_requested = pyqtSignal(str, str, float)
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.notifications = []
-        self.corner = "bottom-right"
-        self.offset = (10, 30)  # lower default
-        self.show_requested.connect(self._on_show_requested, type=Qt.ConnectionType.QueuedConnection)
-        print("PyQt6 Notification system started")
-
-    def set_position(self, corner=None, offset=None):
-        """Change default and reposition current notifications right away."""
-        if corner is not None:
-            self.corner = corner
-        if offset is not None:
-            self.offset = offset
-        for n in list(self.notifications):
-            if n.isVisible():
-                n.set_anchor(self.corner, self.offset)
-
-    def suggest_shortcut(self, action, shortcut, duration=3.0):
-        self.show_requested.emit(action, shortcut, float(duration))
-
-    def _on_show_requested(self, action, shortcut, duration):
-        try:
-            message = f"Use {shortcut} to {action.lower()}"
-            notification = LiquidGlassNotification(
-                message, shortcut, duration,
-                corner=self.corner, offset=self.offset
-            )
-            notification.show_notification()
-            self.notifications.append(notification)
-            self.notifications = [n for n in self.notifications if n.isVisible()]
-            print(f"🔔 NOTIFICATION: {message}")
-        except Exception as e:
-            print(f"Error showing PyQt6 notification: {e}")
-            print(f"🔔 NOTIFICATION: Use {shortcut} to {action.lower()}")
-
-    def stop(self):
-        for notification in self.notifications:
-            if notification.isVisible():
-                notification.close()
-        self.notifications.clear()
-
-
-# Demo and usage
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    notifier = PyQt6NotificationSystem()
-
-    notifier.suggest_shortcut("Copy", "Ctrl+C", duration=3.0)
-
-    QTimer.singleShot(6000, app.quit)
-    sys.exit(app.exec())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Notification System for Shortcut Coach
+Queues shortcut suggestions from any thread and shows them in one reusable glass notification
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal
+from notification_pyqt6 import LiquidGlassNotification
+
+
+class PyQt6NotificationSystem(QObject):
+    """Thread-safe notification system with global position control."""
+    show_requested = pyqtSignal(str, str, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.notification = None  # one window, reused for every suggestion
+        self.corner = "bottom-right"
+        self.offset = (10, 30)  # lower default
+        self.show_requested.connect(self._on_show_requested, type=Qt.ConnectionType.QueuedConnection)
+
+        # Requests arriving within 50ms of each other are shown as one notification
+        self._pending = []  # (message, shortcut, duration) in the current burst
+        self._burst_timer = QTimer(self)
+        self._burst_timer.setSingleShot(True)
+        self._burst_timer.setInterval(50)
+        self._burst_timer.timeout.connect(self._show_pending)
+
+        # Messages shown recently are not shown again until their TTL passes
+        self._recent = OrderedDict()  # message -> monotonic time shown
+        self.recent_ttl = 2.0
+        self.max_recent = 32
+        print("PyQt6 Notification system started")
+
+    def set_position(self, corner=None, offset=None):
+        """Change default and reposition current notifications right away."""
+        if corner is not None:
+            self.corner = corner
+        if offset is not None:
+            self.offset = offset
+        if self.notification is not None and self.notification.isVisible():
+            self.notification.set_anchor(self.corner, self.offset)
+
+    def suggest_shortcut(self, action, shortcut, duration=3.0):
+        self.show_requested.emit(action, shortcut, float(duration))
+
+    def _on_show_requested(self, action, shortcut, duration):
+        message = f"Use {shortcut} to {action.lower()}"
+        self._pending.append((message, shortcut, duration))
+        if not self._burst_timer.isActive():
+            self._burst_timer.start()
+
+    def _show_pending(self):
+        """Show the burst collected by the burst timer as a single notification"""
+        batch, self._pending = self._pending, []
+        now = time.monotonic()
+
+        # Dedupe the burst, then drop anything still within its recent TTL
+        fresh = []
+        for message, shortcut, duration in dict((item[0], item) for item in batch).values():
+            shown_at = self._recent.get(message)
+            if shown_at is not None and now - shown_at < self.recent_ttl:
+                continue
+            self._recent[message] = now
+            self._recent.move_to_end(message)
+            fresh.append((message, shortcut, duration))
+        while len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+
+        if not fresh:
+            return
+        if len(fresh) == 1:
+            message, shortcut, duration = fresh[0]
+        else:
+            message = "  ·  ".join(item[0] for item in fresh)
+            shortcut = ", ".join(item[1] for item in fresh)
+            duration = max(item[2] for item in fresh)
+        self._show_message(message, shortcut, duration)
+
+    def _show_message(self, message, shortcut, duration):
+        try:
+            if self.notification is None:
+                self.notification = LiquidGlassNotification(
+                    message, shortcut, duration,
+                    corner=self.corner, offset=self.offset
+                )
+            else:
+                # Replace whatever is showing instead of building a new window
+                self.notification.corner = self.corner
+                self.notification.offset = self.offset
+                self.notification.set_message(message, shortcut, duration)
+            self.notification.show_notification()
+            print(f"🔔 NOTIFICATION: {message}")
+        except Exception as e:
+            print(f"Error showing PyQt6 notification: {e}")
+            print(f"🔔 NOTIFICATION: {message}")
+
+    def stop(self):
+        self._burst_timer.stop()
+        self._pending.clear()
+        if self.notification is not None:
+            self.notification.close()
+            self.notification = None
+
+
+# Demo and usage
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    notifier = PyQt6NotificationSystem()
+
+    notifier.suggest_shortcut("Copy", "Ctrl+C", duration=3.0)
+
+    QTimer.singleShot(6000, app.quit)
+    sys.exit(app.exec())
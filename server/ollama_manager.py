@@ -4,24 +4,76 @@ Ollama Manager for Shortcut Coach
 Handles local LLM integration for AI-powered shortcut suggestions
 """
 
-import requests
 import json
 import time
 from typing import List, Dict, Any, Optional
+from json_scanner import FirstJsonScanner
+
+# Fixed text around the event list in the analysis prompt
+ANALYSIS_PROMPT_HEADER = """Analyze this user behavior and suggest ONE workflow automation.
+
+User Behavior:
+"""
+
+ANALYSIS_PROMPT_FOOTER = """
+
+Look for repetitive workflows where the user copies data FROM one app and pastes it INTO another app.
+Pay attention to the sequence: first app (source) → second app (destination).
+
+Respond with JSON only:
+{
+    "suggestions": [
+        {
+            "shortcut": "Custom shortcut name",
+            "explanation": "I suggest to automate copying FROM [source app] TO [destination app] for [specific data type]"
+        }
+    ]
+}
+
+Focus on ONE workflow that automates repetitive copy-paste tasks between different applications.
+Be specific about the direction: FROM which app TO which app."""
 
 class OllamaManager:
     def __init__(self, model_name: str = "mistral:7b", base_url: str = "http://localhost:11434"):
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
+        self._session = None  # created on first use, see _get_session()
+        
+        # Last availability check, reused for a short while so back-to-back
+        # requests don't each wait on /api/tags
+        self._avail_checked_at = 0.0
+        self._avail_value = False
+        self._avail_ttl = 2.0
+        
+    def _get_session(self):
+        """Shared HTTP session, so calls reuse one keep-alive connection to Ollama"""
+        if self._session is None:
+            # requests is only needed once AI suggestions are asked for, so it is
+            # imported here rather than at GUI startup
+            import requests
+            self._session = requests.Session()
+        return self._session
         
     def is_available(self) -> bool:
-        """Check if Ollama service is running and accessible"""
+        """Check if Ollama service is running and accessible (cached for a couple of seconds)"""
+        now = time.monotonic()
+        if now - self._avail_checked_at < self._avail_ttl:
+            return self._avail_value
+        
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self._get_session().get(f"{self.base_url}/api/tags", timeout=5)
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+        
+        self._avail_value = available
+        self._avail_checked_at = time.monotonic()
+        return available
+    
+    def invalidate_availability(self):
+        """Forget the cached availability so the next is_available() checks again"""
+        self._avail_checked_at = 0.0
     
     def generate_suggestions(self, user_behavior_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -45,7 +97,7 @@ class OllamaManager:
             prompt = self._build_analysis_prompt(user_behavior_data)
             
             # Call Ollama API
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, json_mode=True)
             
             # Parse and structure the response
             suggestions = self._parse_llm_response(response)
@@ -68,67 +120,75 @@ class OllamaManager:
         """Build a comprehensive prompt for the LLM to analyze user behavior"""
         
         # Convert behavior data to readable format
-        events_summary = []
-        for event in behavior_data:
-            timestamp = event.get('timestamp', 'Unknown')
-            event_type = event.get('event_type', 'Unknown')
-            details = event.get('details', '')
-            app_name = event.get('app_name', 'Unknown')
-            
-            events_summary.append(f"- {timestamp}: {event_type} - {details} (in {app_name})")
-        
-        events_text = "\n".join(events_summary)
-        
-        prompt = f"""Analyze this user behavior and suggest ONE workflow automation.
-
-User Behavior:
-{events_text}
-
-Look for repetitive workflows where the user copies data FROM one app and pastes it INTO another app.
-Pay attention to the sequence: first app (source) → second app (destination).
-
-Respond with JSON only:
-{{
-    "suggestions": [
-        {{
-            "shortcut": "Custom shortcut name",
-            "explanation": "I suggest to automate copying FROM [source app] TO [destination app] for [specific data type]"
-        }}
-    ]
-}}
-
-Focus on ONE workflow that automates repetitive copy-paste tasks between different applications.
-Be specific about the direction: FROM which app TO which app."""
+        events_text = "\n".join(
+            f"- {e.get('timestamp', 'Unknown')}: {e.get('event_type', 'Unknown')} - "
+            f"{e.get('details', '')} (in {e.get('app_name', 'Unknown')})"
+            for e in behavior_data
+        )
         
-        return prompt
+        return ANALYSIS_PROMPT_HEADER + events_text + ANALYSIS_PROMPT_FOOTER
     
-    def _call_ollama(self, prompt: str) -> str:
-        """Make API call to Ollama"""
+    def _call_ollama(self, prompt: str, json_mode: bool = False) -> str:
+        """Make API call to Ollama
+        
+        With json_mode the model is constrained to a single JSON object, so the
+        generation (and the stream) normally ends right after it.
+        """
         
         payload = {
             "model": self.model_name,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": 0.3,  # Lower temperature for more consistent output
                 "top_p": 0.9,
                 "num_predict": 1024  # Reduced from 2048 for faster generation
             }
         }
+        if json_mode:
+            payload["format"] = "json"
         
+        session = self._get_session()
+        import requests  # already loaded by _get_session(), so this is a cache lookup
         try:
-            response = requests.post(
+            with session.post(
                 self.api_url,
                 json=payload,
-                timeout=180  # Increased to 180 seconds
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get('response', '')
+                timeout=180,  # Increased to 180 seconds
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                # Ollama streams one JSON line per token batch. Reading to the
+                # final "done" line lets the connection go back to the pool; in
+                # JSON mode the read also stops once the object is closed, which
+                # drops the connection but cancels any trailing generation
+                parts = []
+                scanner = FirstJsonScanner() if json_mode else None
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    text = chunk.get('response', '')
+                    parts.append(text)
+                    if chunk.get('done') or (scanner is not None and scanner.feed(text)):
+                        break
+                return ''.join(parts)
             
         except requests.exceptions.RequestException as e:
+            self.invalidate_availability()
             raise Exception(f"Ollama API call failed: {str(e)}")
+        except ValueError as e:
+            # Includes json.JSONDecodeError for a malformed stream line
+            raise Exception(f"Ollama API call failed: invalid response stream ({e})")
+    
+    @staticmethod
+    def _extract_first_json(text: str) -> Optional[str]:
+        """Return the first complete top-level {...} object in text, or None"""
+        scanner = FirstJsonScanner()
+        if scanner.feed(text):
+            return text[scanner.start:scanner.end]
+        return None
     
     def _parse_llm_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse the LLM response and extract structured suggestions"""
@@ -136,11 +196,9 @@ Be specific about the direction: FROM which app TO which app."""
         try:
             # Try to extract JSON from the response
             # Sometimes LLMs add extra text before/after JSON
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
+            json_str = self._extract_first_json(response)
             
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx]
+            if json_str is not None:
                 parsed = json.loads(json_str)
                 
                 # Extract suggestions
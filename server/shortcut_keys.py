@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shortcut Keys for Shortcut Coach
+Maps shortcut key combinations to the keys logged in the events database
+"""
+
+import functools
+
+# Common shortcuts mapped to their database keys
+SHORTCUT_DB_KEYS = {
+    "Ctrl + C": "SHORTCUT_CTRL_C",
+    "Ctrl + V": "SHORTCUT_CTRL_V",
+    "Ctrl + X": "SHORTCUT_CTRL_X",
+    "Ctrl + S": "SHORTCUT_CTRL_S",
+    "Ctrl + N": "SHORTCUT_CTRL_N",
+    "Ctrl + O": "SHORTCUT_CTRL_O",
+    "Ctrl + Z": "SHORTCUT_CTRL_Z",
+    "Ctrl + Y": "SHORTCUT_CTRL_Y",
+    "Ctrl + F": "SHORTCUT_CTRL_F",
+    "Ctrl + H": "SHORTCUT_CTRL_H",
+    "Ctrl + P": "SHORTCUT_CTRL_P",
+    "Ctrl + A": "SHORTCUT_CTRL_A",
+    "Ctrl + B": "SHORTCUT_CTRL_B",
+    "Ctrl + I": "SHORTCUT_CTRL_I",
+    "Ctrl + U": "SHORTCUT_CTRL_U",
+    "Ctrl + T": "SHORTCUT_CTRL_T",
+    "Ctrl + W": "SHORTCUT_CTRL_W",
+    "Ctrl + D": "SHORTCUT_CTRL_D",
+    "Ctrl + Tab": "SHORTCUT_CTRL_TAB",
+    "Ctrl + Arrow Keys": "SHORTCUT_CTRL_ARROW",
+    "Ctrl + ↑": "SHORTCUT_CTRL_ARROW_UP",
+    "Ctrl + ↓": "SHORTCUT_CTRL_ARROW_DOWN",
+    "Ctrl + ←": "SHORTCUT_CTRL_ARROW_LEFT",
+    "Ctrl + →": "SHORTCUT_CTRL_ARROW_RIGHT",
+    "Ctrl + Space": "SHORTCUT_CTRL_SPACE",
+    "Shift + Space": "SHORTCUT_SHIFT_SPACE",
+    "Ctrl + Page Up/Page Down": "SHORTCUT_CTRL_PAGE_UP_DOWN",
+    "F5": "SHORTCUT_F5",
+    "Alt + ←": "SHORTCUT_ALT_LEFT",
+    "Alt + →": "SHORTCUT_ALT_RIGHT",
+    "Tab": "SHORTCUT_TAB",
+    "Shift + Tab": "SHORTCUT_SHIFT_TAB",
+    "F2": "SHORTCUT_F2"
+}
+
+@functools.lru_cache(maxsize=256)
+def _fallback_database_key(shortcut):
+    """Database key for a shortcut missing from SHORTCUT_DB_KEYS ("Ctrl + Shift + L" -> "SHORTCUT_CTRL_SHIFT_L")"""
+    return "SHORTCUT_" + shortcut.replace(" + ", "_").replace(" ", "_").upper()
+
+
+def shortcut_database_key(shortcut):
+    """Database key logged for a shortcut string (e.g. "Ctrl + C" -> "SHORTCUT_CTRL_C")"""
+    key = SHORTCUT_DB_KEYS.get(shortcut)
+    return key if key is not None else _fallback_database_key(shortcut)
@@ -4,6 +4,27 @@ Central Shortcut Manager for Shortcut Coach
 Single source of truth for all shortcut detection and mapping logic
 """
 
+import re
+import functools
+from shortcut_keys import shortcut_database_key
+
+# Optional: single-pass keyword matching via pyahocorasick
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# App-name substrings mapped to a shortcut category, checked in priority order.
+# Apps matching none of these fall back to the generic shortcuts.
+APP_CATEGORY_RULES = (
+    (("excel",), "excel"),
+    (("cursor", "code"), "editor"),
+    (("chrome", "google"), "browser"),
+)
+
+# C-level "contains a digit" test for element names
+_HAS_DIGIT = re.compile(r"\d").search
+
 class ShortcutManager:
     """Central manager for all shortcut detection and mapping"""
     
@@ -29,7 +50,9 @@ class ShortcutManager:
             "edit_cell": ("F2", "Edit cell content"),
             "bold": ("Ctrl + B", "Bold"),
             "italic": ("Ctrl + I", "Italic"),
-            "underline": ("Ctrl + U", "Underline")
+            "underline": ("Ctrl + U", "Underline"),
+            # Suggested for clicks into a cell address box (see _check_excel_shortcuts)
+            "cell_navigation": ("Ctrl + Arrow Keys", "Jump to the edge of data region")
         }
         
         # Cursor/VS Code shortcuts
@@ -91,71 +114,128 @@ class ShortcutManager:
             "print": ("Ctrl + P", "Print"),
             "select_all": ("Ctrl + A", "Select All")
         }
+        
+        # Category -> checker, and a per-app-name cache of resolved categories
+        self._category_checks = {
+            "excel": self._check_excel_shortcuts,
+            "editor": self._check_editor_shortcuts,
+            "browser": self._check_browser_shortcuts,
+            "generic": self._check_generic_shortcuts
+        }
+        self._app_categories = {}
+        
+        # One keyword automaton per category when pyahocorasick is available
+        self._keyword_automata = self._build_keyword_automata() if ahocorasick else {}
+        
+        # The same toolbar buttons get clicked over and over, so memoize lookups
+        self._cached_check = functools.lru_cache(maxsize=2048)(self._check_category)
+        
+        # Shortest keyword per category; shorter element names cannot match any
+        self._min_keyword_len = {
+            category: min(map(len, shortcuts))
+            for category, shortcuts in (("excel", self.excel_shortcuts),
+                                        ("editor", self.editor_shortcuts),
+                                        ("browser", self.browser_shortcuts),
+                                        ("generic", self.generic_shortcuts))
+        }
+        
+        # Every shortcut key combination across all categories, sorted for display
+        self._all_supported = tuple(sorted({
+            shortcut_tuple[0]  # Just the shortcut, not description
+            for shortcuts_dict in (self.excel_shortcuts, self.editor_shortcuts,
+                                   self.browser_shortcuts, self.generic_shortcuts)
+            for shortcut_tuple in shortcuts_dict.values()
+        }))
+    
+    def _build_keyword_automata(self):
+        """Build an Aho-Corasick automaton over each category's keywords"""
+        automata = {}
+        for category, shortcuts in (("excel", self.excel_shortcuts),
+                                    ("editor", self.editor_shortcuts),
+                                    ("browser", self.browser_shortcuts),
+                                    ("generic", self.generic_shortcuts)):
+            automaton = ahocorasick.Automaton()
+            for index, (keyword, shortcut_info) in enumerate(shortcuts.items()):
+                automaton.add_word(keyword, (index, shortcut_info))
+            automaton.make_automaton()
+            automata[category] = automaton
+        return automata
+    
+    def _match_keyword(self, category, shortcuts, element_name):
+        """Return the shortcut of the first keyword (in table order) found in element_name"""
+        if len(element_name) < self._min_keyword_len[category]:
+            return None
+        
+        automaton = self._keyword_automata.get(category)
+        if automaton is None:
+            for keyword, shortcut_info in shortcuts.items():
+                if keyword in element_name:
+                    return shortcut_info
+            return None
+        
+        # One pass over the name; keep the earliest table entry to match the fallback
+        best = None
+        for _, (index, shortcut_info) in automaton.iter(element_name):
+            if best is None or index < best[0]:
+                best = (index, shortcut_info)
+        return best[1] if best else None
+    
+    def _check_category(self, category, element_name, element_type):
+        """Run the shortcut checker for a category (uncached)"""
+        return self._category_checks[category](element_name, element_type)
+    
+    def _app_category(self, app_name):
+        """Resolve an app name to its shortcut category, scanning the rules once per app"""
+        category = self._app_categories.get(app_name)
+        if category is None:
+            category = "generic"
+            for keywords, rule_category in APP_CATEGORY_RULES:
+                if any(keyword in app_name for keyword in keywords):
+                    category = rule_category
+                    break
+            self._app_categories[app_name] = category
+        return category
     
     def get_shortcut_suggestion(self, element_info, app_name=None):
         """Get shortcut suggestion based on clicked element and app context"""
-        if "error" in element_info:
+        if element_info.error:
             return None
         
-        element_name = element_info.get("name", "").lower()
-        element_type = element_info.get("type", "").lower()
-        app_name = app_name or element_info.get("app_name", "").lower()
+        element_name = element_info.name_lower
+        element_type = element_info.type_lower
+        app_name = app_name or element_info.app_name_lower
+        
+        # Unnamed containers are common and can never match
+        if not element_name:
+            return None
         
         # Prevent false positives from UI navigation elements
         if "shortcut" in element_name:
             return None
         
-        # Excel-specific shortcuts
-        if "excel" in app_name:
-            return self._check_excel_shortcuts(element_name, element_type)
-        
-        # Cursor/VS Code shortcuts
-        elif "cursor" in app_name or "code" in app_name:
-            return self._check_editor_shortcuts(element_name, element_type)
-        
-        # Chrome shortcuts
-        elif "chrome" in app_name or "google" in app_name:
-            return self._check_browser_shortcuts(element_name, element_type)
-        
-        # Generic shortcuts for any application
-        return self._check_generic_shortcuts(element_name, element_type)
+        # Dispatch to the checker for this app (Excel, editor, browser or generic)
+        return self._cached_check(self._app_category(app_name), element_name, element_type)
     
     def _check_excel_shortcuts(self, element_name, element_type):
         """Check for Excel-specific shortcuts"""
         # Check for cell navigation (most common Excel shortcut)
-        if element_type == "edit" and any(char.isdigit() for char in element_name):
+        if element_type == "edit" and _HAS_DIGIT(element_name):
             return self.excel_shortcuts["cell_navigation"]
         
         # Check for other Excel shortcuts
-        for keyword, shortcut_info in self.excel_shortcuts.items():
-            if keyword in element_name:
-                return shortcut_info
-        
-        return None
+        return self._match_keyword("excel", self.excel_shortcuts, element_name)
     
     def _check_editor_shortcuts(self, element_name, element_type):
         """Check for editor-specific shortcuts"""
-        for keyword, shortcut_info in self.editor_shortcuts.items():
-            if keyword in element_name:
-                return shortcut_info
-        
-        return None
+        return self._match_keyword("editor", self.editor_shortcuts, element_name)
     
     def _check_browser_shortcuts(self, element_name, element_type):
         """Check for browser-specific shortcuts"""
-        for keyword, shortcut_info in self.browser_shortcuts.items():
-            if keyword in element_name:
-                return shortcut_info
-        
-        return None
+        return self._match_keyword("browser", self.browser_shortcuts, element_name)
     
     def _check_generic_shortcuts(self, element_name, element_type):
         """Check for generic shortcuts (lowest priority)"""
-        for keyword, shortcut_info in self.generic_shortcuts.items():
-            if keyword in element_name:
-                return shortcut_info
-        
-        return None
+        return self._match_keyword("generic", self.generic_shortcuts, element_name)
     
     def get_shortcut_database_key(self, shortcut_tuple):
         """Convert shortcut tuple to database key for consistent logging"""
@@ -163,54 +243,19 @@ class ShortcutManager:
             return None
         
         shortcut, description = shortcut_tuple
-        
-        # Map common shortcuts to database keys
-        shortcut_mapping = {
-            "Ctrl + C": "SHORTCUT_CTRL_C",
-            "Ctrl + V": "SHORTCUT_CTRL_V",
-            "Ctrl + X": "SHORTCUT_CTRL_X",
-            "Ctrl + S": "SHORTCUT_CTRL_S",
-            "Ctrl + N": "SHORTCUT_CTRL_N",
-            "Ctrl + O": "SHORTCUT_CTRL_O",
-            "Ctrl + Z": "SHORTCUT_CTRL_Z",
-            "Ctrl + Y": "SHORTCUT_CTRL_Y",
-            "Ctrl + F": "SHORTCUT_CTRL_F",
-            "Ctrl + H": "SHORTCUT_CTRL_H",
-            "Ctrl + P": "SHORTCUT_CTRL_P",
-            "Ctrl + A": "SHORTCUT_CTRL_A",
-            "Ctrl + B": "SHORTCUT_CTRL_B",
-            "Ctrl + I": "SHORTCUT_CTRL_I",
-            "Ctrl + U": "SHORTCUT_CTRL_U",
-            "Ctrl + T": "SHORTCUT_CTRL_T",
-            "Ctrl + W": "SHORTCUT_CTRL_W",
-            "Ctrl + D": "SHORTCUT_CTRL_D",
-            "Ctrl + Tab": "SHORTCUT_CTRL_TAB",
-            "Ctrl + Arrow Keys": "SHORTCUT_CTRL_ARROW",
-            "Ctrl + ↑": "SHORTCUT_CTRL_ARROW_UP",
-            "Ctrl + ↓": "SHORTCUT_CTRL_ARROW_DOWN",
-            "Ctrl + ←": "SHORTCUT_CTRL_ARROW_LEFT",
-            "Ctrl + →": "SHORTCUT_CTRL_ARROW_RIGHT",
-            "Ctrl + Space": "SHORTCUT_CTRL_SPACE",
-            "Shift + Space": "SHORTCUT_SHIFT_SPACE",
-            "Ctrl + Page Up/Page Down": "SHORTCUT_CTRL_PAGE_UP_DOWN",
-            "F5": "SHORTCUT_F5",
-            "Alt + ←": "SHORTCUT_ALT_LEFT",
-            "Alt + →": "SHORTCUT_ALT_RIGHT",
-            "Tab": "SHORTCUT_TAB",
-            "Shift + Tab": "SHORTCUT_SHIFT_TAB",
-            "F2": "SHORTCUT_F2"
-        }
-        
-        return shortcut_mapping.get(shortcut, f"SHORTCUT_{shortcut.replace(' + ', '_').replace(' ', '_').upper()}")
+        return shortcut_database_key(shortcut)
     
     def get_all_supported_shortcuts(self):
-        """Get list of all supported shortcuts for GUI display"""
-        all_shortcuts = set()
-        
-        # Collect all shortcuts from all categories
-        for shortcuts_dict in [self.excel_shortcuts, self.editor_shortcuts, 
-                             self.browser_shortcuts, self.generic_shortcuts]:
-            for shortcut_tuple in shortcuts_dict.values():
-                all_shortcuts.add(shortcut_tuple[0])  # Just the shortcut, not description
-        
-        return sorted(list(all_shortcuts))
+        """Get all supported shortcuts for GUI display (a precomputed, sorted tuple)"""
+        return self._all_supported
+
+# One ShortcutManager for the whole process; its tables are constants and its
+# lookup caches are shared by every caller
+_default_manager = None
+
+def get_default_shortcut_manager():
+    """Return the process-wide ShortcutManager, creating it on first use"""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = ShortcutManager()
+    return _default_manager
@@ -3,6 +3,9 @@ Shortcuts Database - Common keyboard shortcuts that users want notifications for
 Organized by category for easy lookup and suggestion
 """
 
+import sys
+from types import MappingProxyType
+
 SHORTCUTS_DATABASE = {
     # Windows (General OS)
     "windows_general": {
@@ -73,6 +76,31 @@ SHORTCUTS_DATABASE = {
     }
 }
 
+# The table is fixed: freeze it, and intern its strings so shortcuts that repeat
+# across categories ("Ctrl + C", "Copy", ...) share one object
+SHORTCUTS_DATABASE = MappingProxyType({
+    category: MappingProxyType({
+        sys.intern(shortcut): sys.intern(description)
+        for shortcut, description in shortcuts.items()
+    })
+    for category, shortcuts in SHORTCUTS_DATABASE.items()
+})
+
+# Every shortcut with its lowercased fields, computed once for the search helpers:
+# (shortcut_lower, description_lower, category_lower, shortcut, description)
+_FLAT_SHORTCUTS = [
+    (shortcut.lower(), description.lower(), category.lower(), shortcut, description)
+    for category, shortcuts in SHORTCUTS_DATABASE.items()
+    for shortcut, description in shortcuts.items()
+]
+
+# All categories merged into one flat, read-only mapping (later categories win on duplicate keys)
+_ALL_SHORTCUTS = MappingProxyType({
+    shortcut: description
+    for shortcuts in SHORTCUTS_DATABASE.values()
+    for shortcut, description in shortcuts.items()
+})
+
 def get_shortcut_for_action(action):
     """
     Find a shortcut for a given action
@@ -84,29 +112,25 @@ def get_shortcut_for_action(action):
     action_lower = action.lower()
     
     # Search through all shortcuts
-    for category, shortcuts in SHORTCUTS_DATABASE.items():
-        for shortcut, description in shortcuts.items():
-            if action_lower in description.lower() or action_lower in shortcut.lower():
-                return shortcut, description
+    for shortcut_lower, description_lower, _, shortcut, description in _FLAT_SHORTCUTS:
+        if action_lower in description_lower or action_lower in shortcut_lower:
+            return shortcut, description
     
     return None, None
 
 def get_shortcuts_by_category(category):
     """
     Get all shortcuts for a specific category
-    Returns dictionary of shortcuts or empty dict if category not found
+    Returns a read-only mapping of shortcuts or empty dict if category not found
     """
     return SHORTCUTS_DATABASE.get(category, {})
 
 def get_all_shortcuts():
     """
     Get all shortcuts as a flat dictionary
-    Returns dictionary with all shortcuts
+    Returns a shared read-only mapping; use dict(...) for a modifiable copy
     """
-    all_shortcuts = {}
-    for category, shortcuts in SHORTCUTS_DATABASE.items():
-        all_shortcuts.update(shortcuts)
-    return all_shortcuts
+    return _ALL_SHORTCUTS
 
 def search_shortcuts(query):
     """
@@ -117,13 +141,9 @@ def search_shortcuts(query):
         return []
         
     query_lower = query.lower()
-    results = []
-    
-    for category, shortcuts in SHORTCUTS_DATABASE.items():
-        for shortcut, description in shortcuts.items():
-            if (query_lower in shortcut.lower() or 
-                query_lower in description.lower() or
-                query_lower in category.lower()):
-                results.append((shortcut, description))
     
-    return results
+    return [(shortcut, description)
+            for shortcut_lower, description_lower, category_lower, shortcut, description in _FLAT_SHORTCUTS
+            if (query_lower in shortcut_lower or
+                query_lower in description_lower or
+                query_lower in category_lower)]
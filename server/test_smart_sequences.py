@@ -149,6 +149,36 @@ try:
         print(f"✅ Navigation summary: {summary}")
         print(f"✅ Expected: User navigated to cd proj in Hyper")
     
+    # Test 3: Coalesced typing burst ("Key Sequence" row + enter)
+    print("\n🧪 Test 3: Coalesced typing burst")
+    burst_events = [
+        {
+            'event_type': 'Key Sequence',
+            'details': 'help',
+            'window_title': 'Cursor',
+            'app_name': 'Cursor',
+            'context_action': 'TYPING',
+            'timestamp': '2024-01-01T10:02:00'
+        },
+        {
+            'event_type': 'Key Press',
+            'details': 'Key.enter',
+            'window_title': 'Cursor',
+            'app_name': 'Cursor',
+            'context_action': '',
+            'timestamp': '2024-01-01T10:02:01'
+        }
+    ]
+    
+    processes = processor.process_events(burst_events)
+    print(f"✅ Processed {len(processes)} processes from typing burst")
+    
+    if processes:
+        process = processes[0]
+        summary = process.get_action_summary()
+        print(f"✅ Typing burst summary: {summary}")
+        print("✅ Expected: User sent 'help' to Cursor")
+    
     print("\n✅ All smart sequence tests completed!")
     
 except ImportError as e:
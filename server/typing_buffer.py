@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Typing Buffer for Shortcut Coach
+Coalesces typed characters into one "Key Sequence" event per typing burst
+"""
+
+import time
+import threading
+
+
+class TypingBuffer:
+    """Collects plain typed characters and hands each finished burst to a callback
+
+    A burst ends after a short idle period, when the typing context changes
+    (e.g. Caps Lock toggled) or when the owner flushes it before other input.
+    """
+
+    def __init__(self, on_burst, idle_flush=0.3):
+        self.on_burst = on_burst  # called as on_burst(text, context)
+        self.idle_flush = idle_flush  # seconds of idle before a burst is logged
+        self._lock = threading.Lock()
+        self._chars = []
+        self._context = "TYPING"
+        self._deadline = 0.0
+
+    def add(self, char, context):
+        """Append a typed character to the current burst"""
+        with self._lock:
+            if self._chars and context != self._context:
+                pending = ("".join(self._chars), self._context)
+                self._chars = []
+            else:
+                pending = None
+            self._chars.append(char)
+            self._context = context
+            self._deadline = time.monotonic() + self.idle_flush
+
+        # Context changed mid-burst: log what was typed before it
+        if pending:
+            self.on_burst(*pending)
+
+    def flush(self):
+        """Log the buffered burst, if any"""
+        with self._lock:
+            if not self._chars:
+                return
+            text = "".join(self._chars)
+            context = self._context
+            self._chars = []
+        self.on_burst(text, context)
+
+    def flush_idle(self):
+        """Flush the burst once the user has paused long enough"""
+        if self._chars and time.monotonic() >= self._deadline:
+            self.flush()
@@ -4,124 +4,151 @@ UI Automation Manager for Shortcut Coach
 Handles Windows UI Automation for detecting UI elements and actions
 """
 
+import sys
 import time
-from pywinauto import Desktop
-import psutil
+import ctypes.wintypes
+from collections import namedtuple, OrderedDict
+from pywinauto.uia_defines import IUIA
 from datetime import datetime
-from shortcut_manager import ShortcutManager
+from shortcut_manager import get_default_shortcut_manager
+from foreground_watcher import ForegroundWatcher, process_name
+from debug_log import logger
+
+
+# Result of detect_ui_element; lowercase fields are computed once per click
+ElemInfo = namedtuple(
+    "ElemInfo",
+    "name name_lower type_lower automation_id class_name app_name app_name_lower "
+    "window_title coordinates bounds center error",
+    defaults=(None,) * 12
+)
 
 
 class UIAutomationManager:
     """Manages Windows UI Automation for detecting UI elements"""
 
+    __slots__ = (
+        "notification_system", "uia", "uia_cache_request", "last_click_ns", "click_cooldown_ns",
+        "shortcut_manager", "last_active_window", "last_active_window_time",
+        "window_cache_duration", "chrome_window_cache_duration", "session_start_time",
+        "element_cache", "element_cache_ttl", "last_foreground", "foreground_watcher",
+        "last_events", "event_cooldown", "max_events_per_type"
+    )
+
     def __init__(self, notification_system):
         self.notification_system = notification_system
-        self.ui_desk = Desktop(backend="uia")
-        self.last_click_time = 0
-        self.click_cooldown = 0.1  # 100ms cooldown between clicks
+        self.uia = IUIA()
+        self.uia_cache_request = self._create_cache_request()
+        self.last_click_ns = 0
+        self.click_cooldown_ns = 100_000_000  # 100ms cooldown between clicks
 
         # Initialize central shortcut manager
-        self.shortcut_manager = ShortcutManager()
+        self.shortcut_manager = get_default_shortcut_manager()
 
-        # Cache for active window info (kept minimal)
+        # Cache for active window info, dropped whenever the foreground snapshot
+        # changes; Chrome gets a shorter TTL since its title changes with the tab
         self.last_active_window = None
         self.last_active_window_time = 0
         self.window_cache_duration = 0.25  # 250ms for non-Chrome
+        self.chrome_window_cache_duration = 0.1
 
         # Session tracking
         self.session_start_time = datetime.now().isoformat()
         print(f"🕐 Session started at: {self.session_start_time}")
 
-        # Dedup to prevent double logging
-        self.last_events = {}  # Track last event of each type
+        # Recent detect_ui_element results by 16px screen bucket; cleared when the
+        # foreground window changes
+        self.element_cache = {}  # (x // 16, y // 16) -> (monotonic expiry, ElemInfo)
+        self.element_cache_ttl = 0.5
+        self.last_foreground = ("", "")
+
+        # Foreground (hwnd, pid) pushed by a WinEvent hook once start() is called;
+        # titles are still read live since they change without a foreground event
+        self.foreground_watcher = ForegroundWatcher()
+
+        # Dedup to prevent double logging: event_type -> LRU of event key -> monotonic
+        # time last logged, each capped so memory stays bounded without sweeps
+        self.last_events = {}
         self.event_cooldown = 1.0  # 1 second cooldown between same event types
+        self.max_events_per_type = 256
+
+    def _create_cache_request(self):
+        """Build a UIA cache request so element lookups fetch every property in one round-trip"""
+        uia_dll = self.uia.UIA_dll
+        cache_request = self.uia.iuia.CreateCacheRequest()
+        for property_id in (uia_dll.UIA_NamePropertyId,
+                            uia_dll.UIA_ControlTypePropertyId,
+                            uia_dll.UIA_ProcessIdPropertyId,
+                            uia_dll.UIA_AutomationIdPropertyId,
+                            uia_dll.UIA_ClassNamePropertyId,
+                            uia_dll.UIA_BoundingRectanglePropertyId):
+            cache_request.AddProperty(property_id)
+        # Only cached properties are needed, not a live reference to the element
+        cache_request.AutomationElementMode = uia_dll.AutomationElementMode_None
+        return cache_request
+
+    def start(self):
+        """Start watching foreground window changes"""
+        self.foreground_watcher.start()
+
+    def stop(self):
+        """Stop watching foreground window changes"""
+        self.foreground_watcher.stop()
+
+    def _element_from_point(self, x, y):
+        """Return (name, control_type, process_id, automation_id, class_name, rect) of the element at (x, y)"""
+        element = self.uia.iuia.ElementFromPointBuildCache(
+            ctypes.wintypes.POINT(x, y), self.uia_cache_request
+        )
+        control_type = self.uia.known_control_type_ids.get(element.CachedControlType, "Unknown")
+        return (element.CachedName, control_type, element.CachedProcessId,
+                element.CachedAutomationId, element.CachedClassName,
+                element.CachedBoundingRectangle)
 
     def should_process_click(self, x, y):
         """Check if we should process this click (avoid duplicates)"""
-        current_time = time.time()
-        if current_time - self.last_click_time < self.click_cooldown:
+        now = time.monotonic_ns()
+        if now - self.last_click_ns < self.click_cooldown_ns:
             return False
-        self.last_click_time = current_time
+        self.last_click_ns = now
         return True
 
-    def _wait_for_title_settle(self, hwnd, timeout=0.5, step=0.04):
-        """Poll GetWindowText until it stabilizes or timeout"""
-        import win32gui
-        t0 = time.time()
-        last = win32gui.GetWindowText(hwnd) or ""
-        while time.time() - t0 < timeout:
-            time.sleep(step)
-            cur = win32gui.GetWindowText(hwnd) or ""
-            if cur != last:
-                # confirm stability with one extra read
-                time.sleep(step)
-                cur2 = win32gui.GetWindowText(hwnd) or ""
-                if cur2 == cur:
-                    return cur
-                last = cur2
-        return last
-
-    def _foreground_info(self, settle_for_chrome=True):
-        """Return (app_name, window_title, hwnd) for current foreground window"""
-        import win32gui
-        import win32process
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            if not hwnd:
-                return ("Unknown", "Unknown", None)
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            app_name = "Unknown"
-            if pid:
-                p = psutil.Process(pid)
-                if p and p.name():
-                    app_name = p.name().replace(".exe", "")
-            if app_name.lower() == "chrome" and settle_for_chrome:
-                title = self._wait_for_title_settle(hwnd)
-            else:
-                title = win32gui.GetWindowText(hwnd) or "Unknown"
-            return (app_name, title, hwnd)
-        except Exception:
-            return ("Unknown", "Unknown", None)
-
-    def _wait_for_foreground_targets(self, targets, timeout=0.5, step=0.02):
-        """
-        Wait until the foreground app name lower() is in targets.
-        If Chrome becomes foreground, also wait for tab title to settle.
-        Returns (app_name, window_title, hwnd). Falls back to last reading on timeout.
-        """
-        t0 = time.time()
-        last = self._foreground_info(settle_for_chrome=False)
-        while time.time() - t0 < timeout:
-            app, title, hwnd = self._foreground_info(settle_for_chrome=False)
-            last = (app, title, hwnd)
-            if app.lower() in targets:
-                # If Chrome, settle the title before returning
-                if app.lower() == "chrome" and hwnd:
-                    settled_title = self._wait_for_title_settle(hwnd)
-                    return (app, settled_title, hwnd)
-                return (app, title, hwnd)
-            time.sleep(step)
-        # Timeout, return last seen
-        app, title, hwnd = last
-        if app.lower() == "chrome" and hwnd:
-            title = self._wait_for_title_settle(hwnd)
-        return (app, title, hwnd)
+    def get_foreground_snapshot(self):
+        """Return (app_name, window_title) of the foreground window without waiting for title settle"""
+        app_name, window_title, _ = self.foreground_watcher.foreground_info(settle_for_chrome=False)
+        snapshot = ("", "") if app_name == "Unknown" else (app_name, window_title)
+        if snapshot != self.last_foreground:
+            # Elements under cached screen positions may belong to another window now
+            self.element_cache.clear()
+            self.last_active_window = None
+            self.last_foreground = snapshot
+        return snapshot
 
     def detect_ui_element(self, x, y):
+        """Detect what UI element was clicked at (x, y), reusing a recent result for the same spot"""
+        bucket = (x // 16, y // 16)
+        now = time.monotonic()
+        cached = self.element_cache.get(bucket)
+        if cached and cached[0] > now:
+            return cached[1]._replace(coordinates=(x, y))
+
+        element_info = self._detect_ui_element_uncached(x, y)
+        if not element_info.error:
+            self.element_cache[bucket] = (now + self.element_cache_ttl, element_info)
+        return element_info
+
+    def _detect_ui_element_uncached(self, x, y):
         """Detect what UI element was clicked at coordinates (x, y) with foreground reconciliation."""
         try:
-            # 1) Read the element under the cursor
-            element = self.ui_desk.from_point(x, y)
-            info = element.element_info
-            rect = element.rectangle()
+            # 1) Read the element under the cursor (single cached UIA round-trip)
+            (element_name, control_type, process_id,
+             automation_id, class_name, rect) = self._element_from_point(x, y)
 
             # 2) App from the clicked element (may be wrong during app switches or taskbar clicks)
             element_app = "Unknown"
             try:
-                if info.process_id:
-                    proc = psutil.Process(info.process_id)
-                    if proc and proc.name():
-                        element_app = proc.name().replace(".exe", "")
+                if process_id:
+                    element_app = process_name(process_id)
             except:
                 pass
 
@@ -129,96 +156,117 @@ class UIAutomationManager:
             #    - the app of the clicked element, or
             #    - Chrome (very common when switching into Chrome)
             targets = set(filter(None, [element_app.lower(), "chrome"]))
-            fg_app, fg_title, _ = self._wait_for_foreground_targets(targets, timeout=0.5, step=0.02)
+            fg_app, fg_title, _ = self.foreground_watcher.wait_for_foreground_targets(targets, timeout=0.5, step=0.02)
 
             window_title = None
             effective_app = fg_app if fg_app != "Unknown" else element_app
-            effective_name = info.name or "Unknown Element"
+            effective_name = element_name or "Unknown Element"
+            # Interned so the handful of app names share one string object
+            app_lower = sys.intern(effective_app.lower())
 
             # Prefer the settled foreground information
-            if effective_app.lower() == "chrome":
+            if app_lower == "chrome":
                 window_title = fg_title
                 # If the clicked element is not from Chrome or has no useful name, use tab title as the element name
-                if not info.name or not info.name.strip() or element_app.lower() != "chrome":
+                if not element_name or not element_name.strip() or element_app.lower() != "chrome":
                     effective_name = fg_title if fg_title and fg_title.strip() else "Chrome Window"
-                print(f"🔍 Chrome Debug - Element: '{info.name}' | Type: {info.control_type} | ID: {getattr(info, 'automation_id', 'None')}")
+                logger.debug("🔍 Chrome Debug - Element: '%s' | Type: %s | ID: %s",
+                             element_name, control_type, automation_id)
 
             # If still unknown name, use window title as a fallback label
             if (not effective_name or effective_name == "Unknown Element") and window_title:
                 effective_name = window_title
 
             if effective_app != "Unknown":
-                print(f"🔍 Detected app: {effective_app} for element: {effective_name}")
+                logger.debug("🔍 Detected app: %s for element: %s", effective_app, effective_name)
 
-            return {
-                "name": effective_name or "Unknown Element",
-                "type": str(info.control_type),
-                "automation_id": getattr(info, "automation_id", None),
-                "class_name": getattr(info, "class_name", None),
-                "app_name": effective_app,
-                "window_title": window_title,  # set for Chrome
-                "coordinates": (x, y),
-                "bounds": (rect.left, rect.top, rect.right, rect.bottom),
-                "center": ((rect.left + rect.right) // 2, (rect.top + rect.bottom) // 2)
-            }
+            effective_name = effective_name or "Unknown Element"
+            return ElemInfo(
+                name=effective_name,
+                name_lower=effective_name.lower(),
+                type_lower=control_type.lower(),
+                automation_id=automation_id,
+                class_name=class_name,
+                app_name=effective_app,
+                app_name_lower=app_lower,
+                window_title=window_title,  # set for Chrome
+                coordinates=(x, y),
+                bounds=(rect.left, rect.top, rect.right, rect.bottom),
+                center=((rect.left + rect.right) // 2, (rect.top + rect.bottom) // 2)
+            )
 
         except Exception as e:
-            return {
-                "error": str(e),
-                "coordinates": (x, y),
-                "app_name": "Unknown",
-                "window_title": None
-            }
+            return ElemInfo(
+                name="Unknown Element",
+                name_lower="unknown element",
+                type_lower="",
+                app_name="Unknown",
+                app_name_lower="unknown",
+                coordinates=(x, y),
+                error=str(e)
+            )
 
     def get_shortcut_suggestion(self, element_info):
         """Get shortcut suggestion using central shortcut manager"""
         return self.shortcut_manager.get_shortcut_suggestion(element_info)
 
-    def should_log_event(self, event_type, details, app_name=None):
-        """Check if we should log this event (prevent duplicates)"""
-        current_time = time.time()
-        event_key = f"{event_type}_{details}_{app_name}"
+    def should_log_event(self, event_type, details, app_name=None, coords=None):
+        """Check if we should log this event (prevent duplicates)
 
-        if event_key in self.last_events:
-            last_time = self.last_events[event_key]
-            if current_time - last_time < self.event_cooldown:
-                return False
+        Events that carry click coordinates are deduplicated by 16px screen
+        bucket rather than by their details text.
+        """
+        current_time = time.monotonic()
+        if coords is not None:
+            event_key = (coords[0] // 16, coords[1] // 16, app_name)
+        else:
+            event_key = (details, app_name)
+
+        recent = self.last_events.get(event_type)
+        if recent is None:
+            recent = self.last_events[event_type] = OrderedDict()
+
+        last_time = recent.get(event_key)
+        if last_time is not None and current_time - last_time < self.event_cooldown:
+            return False
 
-        self.last_events[event_key] = current_time
+        recent[event_key] = current_time
+        recent.move_to_end(event_key)
+        if len(recent) > self.max_events_per_type:
+            recent.popitem(last=False)
         return True
 
     def get_active_window_info(self):
         """Get current active window information"""
-        current_time = time.time()
+        current_time = time.monotonic()
 
-        # Use cache only for non-Chrome to avoid stale tab titles
-        if self.last_active_window:
-            cached = self.last_active_window
-            if cached.get("app_name", "").lower() != "chrome":
-                if current_time - self.last_active_window_time < self.window_cache_duration:
-                    return cached
+        cached = self.last_active_window
+        if cached:
+            if cached["app_name_lower"] == "chrome":
+                ttl = self.chrome_window_cache_duration
+            else:
+                ttl = self.window_cache_duration
+            if current_time - self.last_active_window_time < ttl:
+                return cached
 
         try:
-            app_name, window_title, _ = self._foreground_info(settle_for_chrome=True)
+            app_name, window_title, _ = self.foreground_watcher.foreground_info(settle_for_chrome=True)
             window_info = {
                 "title": window_title or "Unknown",
                 "app_name": app_name,
+                # Lowercased once per lookup and reused while the entry is cached
+                "app_name_lower": sys.intern(app_name.lower()),
                 "timestamp": current_time
             }
 
-            # Cache only for non-Chrome
-            if app_name.lower() != "chrome":
-                self.last_active_window = window_info
-                self.last_active_window_time = current_time
-            else:
-                self.last_active_window = None
-                self.last_active_window_time = 0
-
+            self.last_active_window = window_info
+            self.last_active_window_time = current_time
             return window_info
 
         except Exception:
             return {
                 "title": "Unknown",
                 "app_name": "Unknown",
+                "app_name_lower": "unknown",
                 "timestamp": current_time
             }
@@ -1,6 +1,4 @@
-import psutil
 import time
-from datetime import datetime
 
 class WindowMonitor:
     def __init__(self):